@@ -0,0 +1,314 @@
+"""denormalized comment brand scope
+
+Revision ID: 706e9ee6f51a
+Revises: 89a858603b0d
+Create Date: 2026-10-18 07:05:04.808157
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '706e9ee6f51a'
+down_revision: Union[str, None] = '89a858603b0d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BACKFILL = """
+UPDATE comments c
+SET product_id = v.product_id, brand_id = p.brand_id
+FROM videos v
+JOIN products p ON p.id = v.product_id
+WHERE v.id = c.video_id;
+
+UPDATE comment_keywords ck
+SET product_id = c.product_id, brand_id = c.brand_id
+FROM comments c
+WHERE c.id = ck.comment_id;
+"""
+
+# The database owns the denormalized columns: comments resolve theirs from
+# video -> product -> brand, mappings copy their comment's, and reassigning a
+# video or product re-stamps every row below it. A comment that changes brand
+# moves its share of the materialized brand graph with it.
+BRAND_SCOPE_FUNCTIONS = """
+CREATE OR REPLACE FUNCTION comments_brand_scope() RETURNS trigger AS $$
+BEGIN
+    SELECT v.product_id, p.brand_id INTO NEW.product_id, NEW.brand_id
+    FROM videos v
+    JOIN products p ON p.id = v.product_id
+    WHERE v.id = NEW.video_id;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION comment_keywords_brand_scope() RETURNS trigger AS $$
+BEGIN
+    SELECT c.product_id, c.brand_id INTO NEW.product_id, NEW.brand_id
+    FROM comments c
+    WHERE c.id = NEW.comment_id;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION brand_graph_move_comment(p_comment_id integer, p_brand_id integer,
+                                                    p_sentiment varchar, p_sign integer) RETURNS void AS $$
+BEGIN
+    IF p_brand_id IS NULL THEN
+        RETURN;
+    END IF;
+
+    INSERT INTO brand_keyword_stats AS s (brand_id, keyword_id, weight, positive, negative, neutral)
+    SELECT p_brand_id, keyword_id, p_sign * count(*),
+           p_sign * count(*) * sentiment_flag(p_sentiment, 'positive'),
+           p_sign * count(*) * sentiment_flag(p_sentiment, 'negative'),
+           p_sign * count(*) * sentiment_flag(p_sentiment, 'neutral')
+    FROM comment_keywords
+    WHERE comment_id = p_comment_id
+    GROUP BY keyword_id
+    ON CONFLICT (brand_id, keyword_id) DO UPDATE
+    SET weight = s.weight + EXCLUDED.weight,
+        positive = s.positive + EXCLUDED.positive,
+        negative = s.negative + EXCLUDED.negative,
+        neutral = s.neutral + EXCLUDED.neutral;
+
+    INSERT INTO brand_keyword_cooccurrence AS co (brand_id, keyword_a_id, keyword_b_id, count)
+    SELECT p_brand_id, a.keyword_id, b.keyword_id, p_sign
+    FROM (SELECT DISTINCT keyword_id FROM comment_keywords WHERE comment_id = p_comment_id) a
+    JOIN (SELECT DISTINCT keyword_id FROM comment_keywords WHERE comment_id = p_comment_id) b
+      ON a.keyword_id < b.keyword_id
+    ON CONFLICT (brand_id, keyword_a_id, keyword_b_id) DO UPDATE
+    SET count = co.count + EXCLUDED.count;
+
+    IF p_sign < 0 THEN
+        DELETE FROM brand_keyword_stats WHERE brand_id = p_brand_id AND weight <= 0;
+        DELETE FROM brand_keyword_cooccurrence WHERE brand_id = p_brand_id AND count <= 0;
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION comments_brand_scope_changed() RETURNS trigger AS $$
+BEGIN
+    UPDATE comment_keywords
+    SET product_id = NEW.product_id, brand_id = NEW.brand_id
+    WHERE comment_id = NEW.id;
+
+    IF OLD.brand_id IS DISTINCT FROM NEW.brand_id THEN
+        PERFORM brand_graph_move_comment(NEW.id, OLD.brand_id, OLD.sentiment, -1);
+        PERFORM brand_graph_move_comment(NEW.id, NEW.brand_id, NEW.sentiment, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION videos_brand_scope_changed() RETURNS trigger AS $$
+BEGIN
+    -- comments_brand_scope re-resolves brand_id from the new product
+    UPDATE comments SET product_id = NEW.product_id WHERE video_id = NEW.id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION products_brand_scope_changed() RETURNS trigger AS $$
+BEGIN
+    UPDATE comments SET brand_id = NEW.brand_id WHERE product_id = NEW.id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+BRAND_SCOPE_TRIGGERS = [
+    """
+    CREATE TRIGGER comments_brand_scope
+    BEFORE INSERT OR UPDATE OF video_id, product_id, brand_id ON comments
+    FOR EACH ROW EXECUTE FUNCTION comments_brand_scope()
+    """,
+    """
+    CREATE TRIGGER comments_brand_scope_changed
+    AFTER UPDATE OF video_id, product_id, brand_id ON comments
+    FOR EACH ROW
+    WHEN (OLD.product_id IS DISTINCT FROM NEW.product_id OR OLD.brand_id IS DISTINCT FROM NEW.brand_id)
+    EXECUTE FUNCTION comments_brand_scope_changed()
+    """,
+    """
+    CREATE TRIGGER comment_keywords_brand_scope
+    BEFORE INSERT OR UPDATE OF comment_id, product_id, brand_id ON comment_keywords
+    FOR EACH ROW EXECUTE FUNCTION comment_keywords_brand_scope()
+    """,
+    """
+    CREATE TRIGGER videos_brand_scope_changed
+    AFTER UPDATE OF product_id ON videos
+    FOR EACH ROW WHEN (OLD.product_id IS DISTINCT FROM NEW.product_id)
+    EXECUTE FUNCTION videos_brand_scope_changed()
+    """,
+    """
+    CREATE TRIGGER products_brand_scope_changed
+    AFTER UPDATE OF brand_id ON products
+    FOR EACH ROW WHEN (OLD.brand_id IS DISTINCT FROM NEW.brand_id)
+    EXECUTE FUNCTION products_brand_scope_changed()
+    """,
+]
+BRAND_SCOPE_TRIGGER_TABLES = {
+    "comments_brand_scope": "comments",
+    "comments_brand_scope_changed": "comments",
+    "comment_keywords_brand_scope": "comment_keywords",
+    "videos_brand_scope_changed": "videos",
+    "products_brand_scope_changed": "products",
+}
+
+# The brand graph triggers read the comment's stamped brand_id instead of
+# walking comments -> videos -> products. Only the changed part of each
+# function differs from e0aa27765e46.
+BRAND_GRAPH_APPLY = """
+CREATE OR REPLACE FUNCTION brand_graph_apply(p_comment_id integer, p_keyword_id integer,
+                                             p_row_id integer, p_sign integer) RETURNS void AS $$
+DECLARE
+    v_brand_id integer;
+    v_sentiment varchar;
+BEGIN
+    SELECT {brand_id}, c.sentiment INTO v_brand_id, v_sentiment
+    FROM comments c
+    {joins}
+    WHERE c.id = p_comment_id;
+
+    IF v_brand_id IS NULL THEN
+        RETURN;
+    END IF;
+
+    INSERT INTO brand_keyword_stats AS s (brand_id, keyword_id, weight, positive, negative, neutral)
+    VALUES (v_brand_id, p_keyword_id, p_sign,
+            p_sign * sentiment_flag(v_sentiment, 'positive'),
+            p_sign * sentiment_flag(v_sentiment, 'negative'),
+            p_sign * sentiment_flag(v_sentiment, 'neutral'))
+    ON CONFLICT (brand_id, keyword_id) DO UPDATE
+    SET weight = s.weight + EXCLUDED.weight,
+        positive = s.positive + EXCLUDED.positive,
+        negative = s.negative + EXCLUDED.negative,
+        neutral = s.neutral + EXCLUDED.neutral;
+
+    -- A repeated (comment, keyword) mapping does not add a new co-occurrence
+    IF NOT EXISTS (
+        SELECT 1 FROM comment_keywords
+        WHERE comment_id = p_comment_id AND keyword_id = p_keyword_id AND id <> p_row_id
+    ) THEN
+        INSERT INTO brand_keyword_cooccurrence AS co (brand_id, keyword_a_id, keyword_b_id, count)
+        SELECT v_brand_id, LEAST(p_keyword_id, o.keyword_id), GREATEST(p_keyword_id, o.keyword_id), p_sign
+        FROM (
+            SELECT DISTINCT keyword_id FROM comment_keywords
+            WHERE comment_id = p_comment_id AND keyword_id <> p_keyword_id AND id <> p_row_id
+        ) o
+        ON CONFLICT (brand_id, keyword_a_id, keyword_b_id) DO UPDATE
+        SET count = co.count + EXCLUDED.count;
+    END IF;
+
+    IF p_sign < 0 THEN
+        DELETE FROM brand_keyword_stats WHERE brand_id = v_brand_id AND keyword_id = p_keyword_id AND weight <= 0;
+        DELETE FROM brand_keyword_cooccurrence
+        WHERE brand_id = v_brand_id AND count <= 0
+          AND (keyword_a_id = p_keyword_id OR keyword_b_id = p_keyword_id);
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+COMMENTS_SENTIMENT_BRAND_GRAPH = """
+CREATE OR REPLACE FUNCTION comments_sentiment_brand_graph() RETURNS trigger AS $$
+BEGIN
+    UPDATE brand_keyword_stats s
+    SET positive = s.positive + d.n * (sentiment_flag(NEW.sentiment, 'positive') - sentiment_flag(OLD.sentiment, 'positive')),
+        negative = s.negative + d.n * (sentiment_flag(NEW.sentiment, 'negative') - sentiment_flag(OLD.sentiment, 'negative')),
+        neutral = s.neutral + d.n * (sentiment_flag(NEW.sentiment, 'neutral') - sentiment_flag(OLD.sentiment, 'neutral'))
+    FROM (
+        SELECT {brand_id} AS brand_id, ck.keyword_id, count(*) AS n
+        FROM comment_keywords ck
+        {joins}
+        WHERE ck.comment_id = NEW.id
+        GROUP BY 1, ck.keyword_id
+    ) d
+    WHERE s.brand_id = d.brand_id AND s.keyword_id = d.keyword_id;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+
+def upgrade() -> None:
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.add_column('comment_keywords', sa.Column('product_id', sa.Integer(), nullable=True))
+    op.add_column('comment_keywords', sa.Column('brand_id', sa.Integer(), nullable=True))
+    op.create_index('ix_comment_keywords_brand_id_keyword_id', 'comment_keywords', ['brand_id', 'keyword_id'], unique=False)
+    op.create_index(op.f('ix_comment_keywords_product_id'), 'comment_keywords', ['product_id'], unique=False)
+    op.create_foreign_key('comment_keywords_product_id_fkey', 'comment_keywords', 'products', ['product_id'], ['id'])
+    op.create_foreign_key('comment_keywords_brand_id_fkey', 'comment_keywords', 'brands', ['brand_id'], ['id'])
+    op.add_column('comments', sa.Column('product_id', sa.Integer(), nullable=True))
+    op.add_column('comments', sa.Column('brand_id', sa.Integer(), nullable=True))
+    op.create_index(op.f('ix_comments_brand_id'), 'comments', ['brand_id'], unique=False)
+    op.create_index(op.f('ix_comments_product_id'), 'comments', ['product_id'], unique=False)
+    op.create_foreign_key('comments_brand_id_fkey', 'comments', 'brands', ['brand_id'], ['id'])
+    op.create_foreign_key('comments_product_id_fkey', 'comments', 'products', ['product_id'], ['id'])
+    # ### end Alembic commands ###
+
+    # Neither UPDATE touches the columns the brand graph triggers fire on
+    op.execute(BACKFILL)
+    op.execute(BRAND_SCOPE_FUNCTIONS)
+    for ddl in BRAND_SCOPE_TRIGGERS:
+        op.execute(ddl)
+
+    op.execute(BRAND_GRAPH_APPLY.format(brand_id="c.brand_id", joins=""))
+    op.execute(COMMENTS_SENTIMENT_BRAND_GRAPH.format(brand_id="NEW.brand_id", joins=""))
+    # An update that also moves the comment to another brand is fully handled
+    # by comments_brand_scope_changed (old sentiment out, new sentiment in)
+    op.execute("DROP TRIGGER comments_sentiment_brand_graph ON comments")
+    op.execute("""
+        CREATE TRIGGER comments_sentiment_brand_graph
+        AFTER UPDATE OF sentiment ON comments
+        FOR EACH ROW WHEN (OLD.sentiment IS DISTINCT FROM NEW.sentiment
+                           AND OLD.brand_id IS NOT DISTINCT FROM NEW.brand_id)
+        EXECUTE FUNCTION comments_sentiment_brand_graph()
+    """)
+
+
+def downgrade() -> None:
+    for name, table in BRAND_SCOPE_TRIGGER_TABLES.items():
+        op.execute(f"DROP TRIGGER IF EXISTS {name} ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS products_brand_scope_changed()")
+    op.execute("DROP FUNCTION IF EXISTS videos_brand_scope_changed()")
+    op.execute("DROP FUNCTION IF EXISTS comments_brand_scope_changed()")
+    op.execute("DROP FUNCTION IF EXISTS brand_graph_move_comment(integer, integer, varchar, integer)")
+    op.execute("DROP FUNCTION IF EXISTS comment_keywords_brand_scope()")
+    op.execute("DROP FUNCTION IF EXISTS comments_brand_scope()")
+
+    op.execute("DROP TRIGGER comments_sentiment_brand_graph ON comments")
+    op.execute("""
+        CREATE TRIGGER comments_sentiment_brand_graph
+        AFTER UPDATE OF sentiment ON comments
+        FOR EACH ROW WHEN (OLD.sentiment IS DISTINCT FROM NEW.sentiment)
+        EXECUTE FUNCTION comments_sentiment_brand_graph()
+    """)
+    op.execute(BRAND_GRAPH_APPLY.format(
+        brand_id="p.brand_id",
+        joins="JOIN videos v ON v.id = c.video_id\n    JOIN products p ON p.id = v.product_id",
+    ))
+    op.execute(COMMENTS_SENTIMENT_BRAND_GRAPH.format(
+        brand_id="p.brand_id",
+        joins="JOIN videos v ON v.id = NEW.video_id\n        JOIN products p ON p.id = v.product_id",
+    ))
+
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.drop_constraint('comments_product_id_fkey', 'comments', type_='foreignkey')
+    op.drop_constraint('comments_brand_id_fkey', 'comments', type_='foreignkey')
+    op.drop_index(op.f('ix_comments_product_id'), table_name='comments')
+    op.drop_index(op.f('ix_comments_brand_id'), table_name='comments')
+    op.drop_column('comments', 'brand_id')
+    op.drop_column('comments', 'product_id')
+    op.drop_constraint('comment_keywords_brand_id_fkey', 'comment_keywords', type_='foreignkey')
+    op.drop_constraint('comment_keywords_product_id_fkey', 'comment_keywords', type_='foreignkey')
+    op.drop_index(op.f('ix_comment_keywords_product_id'), table_name='comment_keywords')
+    op.drop_index('ix_comment_keywords_brand_id_keyword_id', table_name='comment_keywords')
+    op.drop_column('comment_keywords', 'brand_id')
+    op.drop_column('comment_keywords', 'product_id')
+    # ### end Alembic commands ###
@@ -0,0 +1,183 @@
+"""materialized brand graph tables
+
+Revision ID: e0aa27765e46
+Revises: 165886a0ad06
+Create Date: 2026-10-18 11:02:17.530921
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e0aa27765e46'
+down_revision: Union[str, None] = '165886a0ad06'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Row-level BEFORE triggers: a trigger for one row sees the rows already
+# processed earlier in the same statement but not its own, so bulk inserts
+# and deletes count every co-occurring pair exactly once.
+BRAND_GRAPH_FUNCTIONS = """
+CREATE OR REPLACE FUNCTION sentiment_flag(sentiment varchar, label varchar) RETURNS integer AS $$
+    SELECT CASE WHEN sentiment = label THEN 1 ELSE 0 END
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION brand_graph_apply(p_comment_id integer, p_keyword_id integer,
+                                             p_row_id integer, p_sign integer) RETURNS void AS $$
+DECLARE
+    v_brand_id integer;
+    v_sentiment varchar;
+BEGIN
+    SELECT p.brand_id, c.sentiment INTO v_brand_id, v_sentiment
+    FROM comments c
+    JOIN videos v ON v.id = c.video_id
+    JOIN products p ON p.id = v.product_id
+    WHERE c.id = p_comment_id;
+
+    IF v_brand_id IS NULL THEN
+        RETURN;
+    END IF;
+
+    INSERT INTO brand_keyword_stats AS s (brand_id, keyword_id, weight, positive, negative, neutral)
+    VALUES (v_brand_id, p_keyword_id, p_sign,
+            p_sign * sentiment_flag(v_sentiment, 'positive'),
+            p_sign * sentiment_flag(v_sentiment, 'negative'),
+            p_sign * sentiment_flag(v_sentiment, 'neutral'))
+    ON CONFLICT (brand_id, keyword_id) DO UPDATE
+    SET weight = s.weight + EXCLUDED.weight,
+        positive = s.positive + EXCLUDED.positive,
+        negative = s.negative + EXCLUDED.negative,
+        neutral = s.neutral + EXCLUDED.neutral;
+
+    -- A repeated (comment, keyword) mapping does not add a new co-occurrence
+    IF NOT EXISTS (
+        SELECT 1 FROM comment_keywords
+        WHERE comment_id = p_comment_id AND keyword_id = p_keyword_id AND id <> p_row_id
+    ) THEN
+        INSERT INTO brand_keyword_cooccurrence AS co (brand_id, keyword_a_id, keyword_b_id, count)
+        SELECT v_brand_id, LEAST(p_keyword_id, o.keyword_id), GREATEST(p_keyword_id, o.keyword_id), p_sign
+        FROM (
+            SELECT DISTINCT keyword_id FROM comment_keywords
+            WHERE comment_id = p_comment_id AND keyword_id <> p_keyword_id AND id <> p_row_id
+        ) o
+        ON CONFLICT (brand_id, keyword_a_id, keyword_b_id) DO UPDATE
+        SET count = co.count + EXCLUDED.count;
+    END IF;
+
+    IF p_sign < 0 THEN
+        DELETE FROM brand_keyword_stats WHERE brand_id = v_brand_id AND keyword_id = p_keyword_id AND weight <= 0;
+        DELETE FROM brand_keyword_cooccurrence
+        WHERE brand_id = v_brand_id AND count <= 0
+          AND (keyword_a_id = p_keyword_id OR keyword_b_id = p_keyword_id);
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION comment_keywords_brand_graph() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        PERFORM brand_graph_apply(OLD.comment_id, OLD.keyword_id, OLD.id, -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM brand_graph_apply(NEW.comment_id, NEW.keyword_id, COALESCE(NEW.id, -1), 1);
+        RETURN NEW;
+    END IF;
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION comments_sentiment_brand_graph() RETURNS trigger AS $$
+BEGIN
+    UPDATE brand_keyword_stats s
+    SET positive = s.positive + d.n * (sentiment_flag(NEW.sentiment, 'positive') - sentiment_flag(OLD.sentiment, 'positive')),
+        negative = s.negative + d.n * (sentiment_flag(NEW.sentiment, 'negative') - sentiment_flag(OLD.sentiment, 'negative')),
+        neutral = s.neutral + d.n * (sentiment_flag(NEW.sentiment, 'neutral') - sentiment_flag(OLD.sentiment, 'neutral'))
+    FROM (
+        SELECT p.brand_id, ck.keyword_id, count(*) AS n
+        FROM comment_keywords ck
+        JOIN videos v ON v.id = NEW.video_id
+        JOIN products p ON p.id = v.product_id
+        WHERE ck.comment_id = NEW.id
+        GROUP BY p.brand_id, ck.keyword_id
+    ) d
+    WHERE s.brand_id = d.brand_id AND s.keyword_id = d.keyword_id;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+BACKFILL = """
+INSERT INTO brand_keyword_stats (brand_id, keyword_id, weight, positive, negative, neutral)
+SELECT p.brand_id, ck.keyword_id, count(*),
+       sum(sentiment_flag(c.sentiment, 'positive')),
+       sum(sentiment_flag(c.sentiment, 'negative')),
+       sum(sentiment_flag(c.sentiment, 'neutral'))
+FROM comment_keywords ck
+JOIN comments c ON c.id = ck.comment_id
+JOIN videos v ON v.id = c.video_id
+JOIN products p ON p.id = v.product_id
+GROUP BY p.brand_id, ck.keyword_id;
+
+INSERT INTO brand_keyword_cooccurrence (brand_id, keyword_a_id, keyword_b_id, count)
+SELECT p.brand_id, a.keyword_id, b.keyword_id, count(*)
+FROM (SELECT DISTINCT comment_id, keyword_id FROM comment_keywords) a
+JOIN (SELECT DISTINCT comment_id, keyword_id FROM comment_keywords) b
+  ON b.comment_id = a.comment_id AND a.keyword_id < b.keyword_id
+JOIN comments c ON c.id = a.comment_id
+JOIN videos v ON v.id = c.video_id
+JOIN products p ON p.id = v.product_id
+GROUP BY p.brand_id, a.keyword_id, b.keyword_id;
+"""
+
+
+def upgrade() -> None:
+    op.create_table('brand_keyword_stats',
+    sa.Column('brand_id', sa.Integer(), nullable=False),
+    sa.Column('keyword_id', sa.Integer(), nullable=False),
+    sa.Column('weight', sa.Integer(), nullable=False),
+    sa.Column('positive', sa.Integer(), nullable=False),
+    sa.Column('negative', sa.Integer(), nullable=False),
+    sa.Column('neutral', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['brand_id'], ['brands.id'], ),
+    sa.ForeignKeyConstraint(['keyword_id'], ['keywords.id'], ),
+    sa.PrimaryKeyConstraint('brand_id', 'keyword_id')
+    )
+    op.create_table('brand_keyword_cooccurrence',
+    sa.Column('brand_id', sa.Integer(), nullable=False),
+    sa.Column('keyword_a_id', sa.Integer(), nullable=False),
+    sa.Column('keyword_b_id', sa.Integer(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['brand_id'], ['brands.id'], ),
+    sa.ForeignKeyConstraint(['keyword_a_id'], ['keywords.id'], ),
+    sa.ForeignKeyConstraint(['keyword_b_id'], ['keywords.id'], ),
+    sa.PrimaryKeyConstraint('brand_id', 'keyword_a_id', 'keyword_b_id')
+    )
+
+    op.execute(BRAND_GRAPH_FUNCTIONS)
+    op.execute("""
+        CREATE TRIGGER comment_keywords_brand_graph
+        BEFORE INSERT OR DELETE OR UPDATE OF comment_id, keyword_id ON comment_keywords
+        FOR EACH ROW EXECUTE FUNCTION comment_keywords_brand_graph()
+    """)
+    op.execute("""
+        CREATE TRIGGER comments_sentiment_brand_graph
+        AFTER UPDATE OF sentiment ON comments
+        FOR EACH ROW WHEN (OLD.sentiment IS DISTINCT FROM NEW.sentiment)
+        EXECUTE FUNCTION comments_sentiment_brand_graph()
+    """)
+    op.execute(BACKFILL)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS comments_sentiment_brand_graph ON comments")
+    op.execute("DROP TRIGGER IF EXISTS comment_keywords_brand_graph ON comment_keywords")
+    op.execute("DROP FUNCTION IF EXISTS comments_sentiment_brand_graph()")
+    op.execute("DROP FUNCTION IF EXISTS comment_keywords_brand_graph()")
+    op.execute("DROP FUNCTION IF EXISTS brand_graph_apply(integer, integer, integer, integer)")
+    op.execute("DROP FUNCTION IF EXISTS sentiment_flag(varchar, varchar)")
+    op.drop_table('brand_keyword_cooccurrence')
+    op.drop_table('brand_keyword_stats')
@@ -1,9 +1,14 @@
 from app.db.session import SessionLocal
 from sqlalchemy.orm import Session
+from app.db.async_session import get_async_sessionmaker
 
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    async with get_async_sessionmaker()() as db:
+        yield db
@@ -1,8 +1,33 @@
-from fastapi import FastAPI
-from app.api.v1 import brand, product, video, comment, keyword, user
+from fastapi import FastAPI, APIRouter
+from fastapi.responses import PlainTextResponse
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.routing import APIRoute
+from app.api.v1 import brand, product, video, comment, keyword, user, graph, async_read
+from app.api.old.model_registry import registry as model_registry
+from app.core.config import settings
+from app.db.async_session import dispose_async_engine
+from app.db.metrics import metrics as db_metrics
 
 app = FastAPI(title="BrandBuzz API", version="1.0.0")
 
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=[origin.strip() for origin in settings.ALLOWED_ORIGINS.split(",") if origin.strip()],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+    expose_headers=["ETag"],
+)
+
+def replace_routes(app: FastAPI, router: APIRouter):
+    """Include `router`, dropping any route already registered for one of its paths and methods."""
+    replaced = {(route.path, method) for route in router.routes for method in route.methods}
+    app.router.routes = [
+        route for route in app.router.routes
+        if not (isinstance(route, APIRoute) and any((route.path, m) in replaced for m in route.methods))
+    ]
+    app.include_router(router)
+
 # Register routers
 app.include_router(brand.router)
 app.include_router(product.router)
@@ -10,6 +35,33 @@ app.include_router(video.router)
 app.include_router(comment.router)
 app.include_router(keyword.router)
 app.include_router(user.router)
+app.include_router(graph.router)
+if settings.DB_ASYNC:
+    # One implementation per path, so the OpenAPI operation ids stay unique
+    replace_routes(app, async_read.router)
+
+
+@app.on_event("startup")
+def warm_up_models():
+    names = [name.strip() for name in settings.WARM_UP_MODELS.split(",") if name.strip()]
+    if names:
+        model_registry.warm_up(names)
+
+
+@app.on_event("shutdown")
+async def close_async_engine():
+    await dispose_async_engine()
+
+
+@app.get("/models", tags=["models"])
+def read_model_metrics():
+    return model_registry.metrics()
+
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def read_db_metrics():
+    # Prometheus text exposition format
+    return PlainTextResponse(db_metrics.render(), media_type="text/plain; version=0.0.4")
 
 
 # import os
@@ -0,0 +1,58 @@
+"""
+Compare throughput of the per-row and bulk comment loaders.
+
+Usage (against a scratch database!):
+    DATABASE_URL=postgresql://... python bench_loader.py --comments 1000 --keywords 40
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+from db_utils import load_comments_to_db, load_comments_to_db_bulk
+
+
+def make_synthetic_data(n_comments, n_keywords, keywords_per_comment=3, seed=0):
+    rng = random.Random(seed)
+    vocab = [f"bench keyword {i}" for i in range(n_keywords)]
+    sentiments = ["positive", "neutral", "negative"]
+    return [
+        {
+            "text": f"synthetic comment {i} " + " ".join(rng.choices(["great", "dry", "skin", "cream"], k=8)),
+            "sentiment": rng.choice(sentiments),
+            "keywords": rng.sample(vocab, k=min(keywords_per_comment, n_keywords)),
+        }
+        for i in range(n_comments)
+    ]
+
+
+def time_loader(loader, json_path, video_url):
+    start = time.perf_counter()
+    loader(json_path, brand_name="BenchBrand", product_name="BenchProduct", video_url=video_url)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--comments", type=int, default=1000)
+    parser.add_argument("--keywords", type=int, default=40)
+    parser.add_argument("--per-comment", type=int, default=3)
+    args = parser.parse_args()
+
+    data = make_synthetic_data(args.comments, args.keywords, args.per_comment)
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False, encoding="utf-8") as f:
+        json.dump(data, f)
+        json_path = f.name
+
+    try:
+        results = {}
+        for name, loader in (("per-row", load_comments_to_db), ("bulk", load_comments_to_db_bulk)):
+            elapsed = time_loader(loader, json_path, f"http://bench.local/{name}")
+            results[name] = elapsed
+            print(f"{name:>8}: {elapsed:.3f}s  ({args.comments / elapsed:,.0f} comments/s)")
+
+        print(f"Speedup: {results['per-row'] / results['bulk']:.1f}x")
+    finally:
+        os.remove(json_path)
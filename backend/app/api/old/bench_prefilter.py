@@ -0,0 +1,51 @@
+"""
+Per-stage timing of the vectorized pre-filter on synthetic comments.
+
+Usage:
+    python bench_prefilter.py --comments 100000
+"""
+import argparse
+import random
+import time
+
+import pandas as pd
+
+from prefilter import mention_only_mask, strip_mentions_series, question_mask
+
+WORDS = ["this", "cream", "is", "so", "good", "my", "skin", "feels", "dry", "love", "it", "cleanser", "broke", "me", "out"]
+TEMPLATES = [
+    lambda rng: "@" + rng.choice(["sam", "jo", "kit"]) + " @" + rng.choice(["lee", "max"]),
+    lambda rng: "@friend " + " ".join(rng.choices(WORDS, k=rng.randint(3, 15))),
+    lambda rng: rng.choice(["how", "does", "can", "why"]) + " " + " ".join(rng.choices(WORDS, k=rng.randint(3, 10))),
+    lambda rng: " ".join(rng.choices(WORDS, k=rng.randint(3, 20))) + "?",
+    lambda rng: " ".join(rng.choices(WORDS, k=rng.randint(3, 25))),
+    lambda rng: "i " + rng.choice(["should", "could", "would"]) + " " + " ".join(rng.choices(WORDS, k=6)),
+]
+
+
+def make_comments(n, seed=0):
+    rng = random.Random(seed)
+    return pd.Series([rng.choice(TEMPLATES)(rng) for _ in range(n)])
+
+
+def timed(label, fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    print(f"{label:<16} {time.perf_counter() - start:8.3f}s")
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--comments", type=int, default=100_000)
+    args = parser.parse_args()
+
+    texts = make_comments(args.comments)
+    print(f"{len(texts):,} synthetic comments")
+
+    mentions = timed("mention-only", mention_only_mask, texts)
+    texts = texts[~mentions]
+    texts = timed("strip-mentions", strip_mentions_series, texts)
+    questions = timed("questions", question_mask, texts)
+
+    print(f"mention-only: {int(mentions.sum()):,}  questions: {int(questions.sum()):,}  kept: {int((~questions).sum()):,}")
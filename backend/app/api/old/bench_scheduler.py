@@ -0,0 +1,110 @@
+"""
+Benchmark scrape_scheduler offline against a stub Apify client.
+
+Usage:
+    python bench_scheduler.py --videos 200 --concurrency 10 --run-seconds 0.2
+"""
+import argparse
+import asyncio
+import itertools
+import random
+import tempfile
+import time
+
+from scrape_scheduler import scrape_videos
+
+
+class StubDataset:
+    def __init__(self, n_items):
+        self.n_items = n_items
+
+    async def iterate_items(self):
+        for i in range(self.n_items):
+            if i % 500 == 0:
+                await asyncio.sleep(0)
+            yield {"cid": str(i), "text": f"stub comment {i}"}
+
+
+class StubRun:
+    def __init__(self, record):
+        self.record = record
+
+    async def get(self):
+        if self.record["status"] == "RUNNING" and time.perf_counter() >= self.record["_done_at"]:
+            self.record["status"] = self.record["_final_status"]
+        return self.record
+
+    async def abort(self):
+        self.record["status"] = "ABORTED"
+        return self.record
+
+
+class StubActor:
+    def __init__(self, client):
+        self.client = client
+
+    async def start(self, run_input):
+        return self.client.new_run(run_input)
+
+
+class StubApifyClient:
+    """Mimics the subset of ApifyClientAsync the scheduler uses, with simulated latency."""
+
+    def __init__(self, run_seconds=0.2, items_per_video=1000, failure_rate=0.0, hang_rate=0.0, seed=0):
+        self.run_seconds = run_seconds
+        self.items_per_video = items_per_video
+        self.failure_rate = failure_rate
+        self.hang_rate = hang_rate
+        self.rng = random.Random(seed)
+        self.runs = {}
+        self.ids = itertools.count()
+
+    def new_run(self, run_input):
+        run_id = f"run-{next(self.ids)}"
+        failed = self.rng.random() < self.failure_rate
+        hung = self.rng.random() < self.hang_rate
+        self.runs[run_id] = {
+            "id": run_id,
+            "status": "RUNNING",
+            "defaultDatasetId": run_id,
+            "_done_at": float("inf") if hung else time.perf_counter() + self.run_seconds,
+            "_final_status": "FAILED" if failed else "SUCCEEDED",
+        }
+        return self.runs[run_id]
+
+    def actor(self, actor_id):
+        return StubActor(self)
+
+    def run(self, run_id):
+        return StubRun(self.runs[run_id])
+
+    def dataset(self, dataset_id):
+        return StubDataset(self.items_per_video)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--videos", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--run-seconds", type=float, default=0.2)
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--failure-rate", type=float, default=0.05)
+    parser.add_argument("--hang-rate", type=float, default=0.02, help="runs that never finish")
+    args = parser.parse_args()
+
+    urls = [f"https://www.tiktok.com/@stub/video/{7000000000000000000 + i}" for i in range(args.videos)]
+    client = StubApifyClient(args.run_seconds, args.items, args.failure_rate, args.hang_rate)
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        start = time.perf_counter()
+        results = asyncio.run(scrape_videos(
+            urls, output_dir=output_dir, client=client, concurrency=args.concurrency,
+            backoff_base=0.05, poll_interval=args.run_seconds / 4, max_wait=args.run_seconds * 5,
+        ))
+        elapsed = time.perf_counter() - start
+
+    ok = sum(1 for r in results if not r.get("error"))
+    retries = sum(r["attempts"] - 1 for r in results)
+    orphaned = sum(1 for run in client.runs.values() if run["status"] == "RUNNING")
+    print(f"{ok}/{len(results)} videos, {retries} retries, {orphaned} runs left running in {elapsed:.2f}s "
+          f"({len(results) / elapsed:.1f} videos/s, serial lower bound {args.videos * args.run_seconds:.1f}s)")
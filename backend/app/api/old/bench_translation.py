@@ -0,0 +1,64 @@
+"""
+Compare per-comment translation with the grouped translation service (one
+cached Translation per language pair) on a small multilingual fixture. Only locally installed Argos packages are used.
+
+Usage:
+    python bench_translation.py --repeat 50
+"""
+import argparse
+import time
+
+import argostranslate.translate
+
+from translation import TranslationRegistry, translate_texts
+
+FIXTURE = [
+    ("fr", "cette crème est vraiment géniale pour la peau sèche"),
+    ("fr", "je l'utilise tous les jours depuis un an"),
+    ("es", "me encanta este limpiador, no reseca la piel"),
+    ("es", "me salieron granos después de usarlo"),
+    ("de", "diese Creme zieht schnell ein und riecht gut"),
+    ("de", "leider ist sie nicht tierversuchsfrei"),
+    ("pt", "o meu dermatologista recomendou esse produto"),
+    ("it", "la uso ogni sera prima di dormire"),
+    ("en", "this one is already english"),
+]
+
+
+def translate_per_comment(texts, langs):
+    """Baseline mirroring the old translate_comment: look up languages on every call."""
+    results = []
+    for text, lang in zip(texts, langs):
+        if lang == "en":
+            results.append(text)
+            continue
+        installed = argostranslate.translate.get_installed_languages()
+        from_lang = next((l for l in installed if l.code == lang), None)
+        to_lang = next((l for l in installed if l.code == "en"), None)
+        results.append(from_lang.get_translation(to_lang).translate(text) if from_lang and to_lang else text)
+    return results
+
+
+def timed(label, fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<24} {elapsed:8.3f}s")
+    return result, elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    langs = [lang for lang, _ in FIXTURE] * args.repeat
+    texts = [text for _, text in FIXTURE] * args.repeat
+    installed = {lang.code for lang in argostranslate.translate.get_installed_languages()}
+    print(f"{len(texts)} comments; installed languages: {sorted(installed)}")
+
+    _, baseline = timed("per-comment", translate_per_comment, texts, langs)
+    registry = TranslationRegistry(auto_install=False)
+    _, grouped = timed("grouped (cold registry)", translate_texts, texts, langs, registry=registry)
+    _, warm = timed("grouped (warm registry)", translate_texts, texts, langs, registry=registry)
+    print(f"Speedup: {baseline / grouped:.1f}x cold, {baseline / warm:.1f}x warm")
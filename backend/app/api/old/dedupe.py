@@ -0,0 +1,79 @@
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from matching import l2_normalize
+
+DEDUPE_BLOCK_SIZE = 2048
+
+
+class UnionFind:
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+
+    def find(self, x: int) -> int:
+        root = x
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[x] != root:  # path compression
+            self.parent[x], x = root, self.parent[x]
+        return root
+
+    def union(self, a: int, b: int):
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            # Keep the lower index as root so clusters are stable across runs
+            if rb < ra:
+                ra, rb = rb, ra
+            self.parent[rb] = ra
+
+
+def near_duplicate_pairs(embeddings, threshold: float,
+                         block_size: int = DEDUPE_BLOCK_SIZE) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Yield (i, j) index arrays, i < j, for every pair with cosine >= threshold.
+
+    Works over block_size x block_size tiles of the upper triangle, so memory
+    is O(block_size^2) rather than O(N^2).
+    """
+    embeddings = l2_normalize(embeddings)
+    n = len(embeddings)
+    for a in range(0, n, block_size):
+        left = embeddings[a:a + block_size]
+        for b in range(a, n, block_size):
+            sims = left @ embeddings[b:b + block_size].T
+            rows, cols = np.nonzero(sims >= threshold)
+            i, j = rows + a, cols + b
+            keep = i < j
+            if keep.any():
+                yield i[keep], j[keep]
+
+
+def cluster_phrases(phrases: Sequence[str], embeddings, threshold: float = 0.85,
+                    weights: Optional[Sequence[float]] = None,
+                    block_size: int = DEDUPE_BLOCK_SIZE) -> Dict[str, str]:
+    """
+    Map every phrase to the canonical phrase of its near-duplicate cluster.
+
+    Clusters are connected components of the "cosine >= threshold" graph.
+    The canonical phrase is the member with the highest weight (e.g. usage
+    count), ties going to the earliest phrase.
+    """
+    uf = UnionFind(len(phrases))
+    for rows, cols in near_duplicate_pairs(embeddings, threshold, block_size):
+        for i, j in zip(rows.tolist(), cols.tolist()):
+            uf.union(i, j)
+
+    best: Dict[int, int] = {}
+    for idx in range(len(phrases)):
+        root = uf.find(idx)
+        current = best.get(root)
+        if current is None or (weights is not None and weights[idx] > weights[current]):
+            best[root] = idx
+
+    return {phrase: phrases[best[uf.find(idx)]] for idx, phrase in enumerate(phrases)}
+
+
+def canonical_phrases(mapping: Dict[str, str], phrases: Sequence[str]) -> List[str]:
+    """Distinct canonical phrases in order of first appearance."""
+    return list(dict.fromkeys(mapping[p] for p in phrases))
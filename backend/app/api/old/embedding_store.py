@@ -0,0 +1,117 @@
+import os
+import re
+import json
+import hashlib
+from typing import Callable, Dict, List
+
+import numpy as np
+
+EMBEDDING_CACHE_DIR = os.environ.get("EMBEDDING_CACHE_DIR", "embedding_cache")
+
+
+def text_key(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingStore:
+    """
+    Append-only embedding cache for one model:
+
+        <root>/<model>/vectors.f32   raw float32 rows, read through np.memmap
+        <root>/<model>/index.txt     one text hash per line; line number == row
+        <root>/<model>/meta.json     {"model": ..., "dim": ...}
+
+    Vectors are appended before their index lines, so a crash mid-write can
+    only leave unindexed trailing rows, which are ignored and overwritten.
+    Intended for a single writer process.
+    """
+
+    def __init__(self, model_name: str, root=EMBEDDING_CACHE_DIR):
+        self.model_name = model_name
+        self.dir = os.path.join(root, re.sub(r"[^\w.-]", "_", model_name))
+        self.vectors_path = os.path.join(self.dir, "vectors.f32")
+        self.index_path = os.path.join(self.dir, "index.txt")
+        self.meta_path = os.path.join(self.dir, "meta.json")
+
+        self.dim = None
+        self.rows: Dict[str, int] = {}
+        self._matrix = None
+
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                self.dim = json.load(f)["dim"]
+        # A store interrupted while being created may have meta.json but no index yet
+        if self.dim is not None and os.path.exists(self.index_path):
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                for row, line in enumerate(f):
+                    self.rows[line.strip()] = row
+
+    def __len__(self):
+        return len(self.rows)
+
+    def matrix(self):
+        """Read-only memmap of all cached vectors (rows are paged in from disk, not copied)."""
+        if self._matrix is None or self._matrix.shape[0] != len(self.rows):
+            if not self.rows:
+                return np.empty((0, self.dim or 0), dtype=np.float32)
+            self._matrix = np.memmap(self.vectors_path, dtype=np.float32, mode="r",
+                                     shape=(len(self.rows), self.dim))
+        return self._matrix
+
+    def _append(self, keys: List[str], vectors: np.ndarray):
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        os.makedirs(self.dir, exist_ok=True)
+
+        if self.dim is None:
+            self.dim = int(vectors.shape[1])
+            # Index first: meta.json is what marks the store as existing
+            open(self.index_path, "w").close()
+            with open(self.meta_path, "w", encoding="utf-8") as f:
+                json.dump({"model": self.model_name, "dim": self.dim}, f)
+
+        # Drop any trailing rows left behind by an interrupted append
+        self._matrix = None
+        with open(self.vectors_path, "ab") as f:
+            f.truncate(len(self.rows) * self.dim * 4)
+            f.write(vectors.tobytes())
+
+        with open(self.index_path, "a", encoding="utf-8") as f:
+            for key in keys:
+                self.rows[key] = len(self.rows)
+                f.write(key + "\n")
+
+    def get_many(self, texts: List[str], encode: Callable[[List[str]], np.ndarray]) -> np.ndarray:
+        """
+        Embeddings for `texts` in order, as a new array (selecting the rows
+        copies them out of the memmap). Only texts missing from the store are
+        passed to `encode` (once each); everything else is read from disk.
+        """
+        keys = [text_key(t) for t in texts]
+
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in self.rows and key not in missing:
+                missing[key] = text
+
+        if missing:
+            vectors = np.asarray(encode(list(missing.values())), dtype=np.float32)
+            self._append(list(missing), vectors)
+
+        if not texts:
+            return np.empty((0, self.dim or 0), dtype=np.float32)
+        return np.asarray(self.matrix()[[self.rows[k] for k in keys]])
+
+
+_stores: Dict[str, EmbeddingStore] = {}
+
+
+def get_embedding_store(model_name: str) -> EmbeddingStore:
+    if model_name not in _stores:
+        _stores[model_name] = EmbeddingStore(model_name)
+    return _stores[model_name]
+
+
+def cached_encoder(model, model_name: str):
+    """Wrap `model.encode` so calls only encode texts the store has not seen."""
+    store = get_embedding_store(model_name)
+    return lambda texts: store.get_many(list(texts), lambda misses: model.encode(misses, convert_to_numpy=True))
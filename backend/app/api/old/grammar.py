@@ -0,0 +1,110 @@
+import os
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import ollama
+
+from llm_cache import DiskCache, content_key
+
+GRAMMAR_MODEL = "llama3"
+GRAMMAR_BATCH_SIZE = 20
+GRAMMAR_WORKERS = 4
+# Bump when the prompt changes so cached corrections are not reused across prompts
+GRAMMAR_PROMPT_VERSION = 1
+
+GRAMMAR_PROMPT = """Fix the grammar, punctuation, and spelling of each comment below.
+Do not change the meaning and do not add notes or justification.
+
+Return JSON of the form {{"corrections": [{{"id": <id>, "text": "<corrected comment>"}}, ...]}}
+with exactly one entry per input id.
+
+Comments:
+{comments}"""
+
+
+def get_ollama_client(host=None):
+    # Honors OLLAMA_HOST, so tests can point this at a local mock server
+    return ollama.Client(host=host or os.environ.get("OLLAMA_HOST"))
+
+
+def clean_correction(text: str) -> str:
+    text = text.strip()
+    if "\n" in text:
+        text = text.split("\n")[-1].strip()
+    return text.strip('“”‘’"\'')
+
+
+def parse_corrections(content: str, n: int) -> dict:
+    """Map batch index -> corrected text; malformed or missing entries are simply absent."""
+    try:
+        data = json.loads(content)
+    except ValueError:
+        return {}
+
+    entries = data.get("corrections", []) if isinstance(data, dict) else data
+    corrections = {}
+    for entry in entries if isinstance(entries, list) else []:
+        if not isinstance(entry, dict):
+            continue
+        idx, text = entry.get("id"), entry.get("text")
+        if isinstance(idx, int) and 0 <= idx < n and isinstance(text, str) and text.strip():
+            corrections[idx] = clean_correction(text)
+    return corrections
+
+
+def correct_batch(client, texts: List[str], model=GRAMMAR_MODEL) -> dict:
+    """One LLM call for a whole batch; returns batch index -> correction for the entries the model returned."""
+    payload = json.dumps([{"id": i, "text": t} for i, t in enumerate(texts)], ensure_ascii=False)
+    try:
+        response = client.chat(
+            model=model,
+            messages=[{"role": "user", "content": GRAMMAR_PROMPT.format(comments=payload)}],
+            format="json",
+        )
+        corrections = parse_corrections(response["message"]["content"], len(texts))
+    except Exception as e:
+        print(f"⚠️ Grammar batch failed ({e}); keeping original text")
+        corrections = {}
+
+    return corrections
+
+
+def fix_grammar_batch(texts: List[str], model=GRAMMAR_MODEL, batch_size=GRAMMAR_BATCH_SIZE,
+                      max_workers=GRAMMAR_WORKERS, client=None, cache=None) -> List[str]:
+    """
+    Correct many comments: cached corrections are reused, unique misses are sent
+    in batches of `batch_size` over up to `max_workers` concurrent requests.
+    """
+    cache = cache or DiskCache("grammar")
+    keys = [content_key(model, GRAMMAR_PROMPT_VERSION, text) for text in texts]
+
+    results = {}
+    misses = {}
+    for key, text in zip(keys, texts):
+        if key in results or key in misses:
+            continue
+        cached = cache.get(key)
+        if cached is not None:
+            results[key] = cached
+        else:
+            misses[key] = text
+
+    print(f"Grammar: {len(results)} cached, {len(misses)} to correct")
+    if misses:
+        client = client or get_ollama_client()
+        miss_keys = list(misses)
+        batches = [miss_keys[i:i + batch_size] for i in range(0, len(miss_keys), batch_size)]
+
+        def run(batch_keys):
+            corrections = correct_batch(client, [misses[k] for k in batch_keys], model)
+            # Only answered entries are cached, so dropped or failed ones are retried next run
+            for i, text in corrections.items():
+                cache.set(batch_keys[i], text)
+            return {batch_keys[i]: text for i, text in corrections.items()}
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for corrected in pool.map(run, batches):
+                results.update(corrected)
+
+    return [results.get(key, text) for key, text in zip(keys, texts)]
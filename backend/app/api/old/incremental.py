@@ -0,0 +1,62 @@
+import os
+import json
+import math
+import hashlib
+from typing import Dict, Iterable, Iterator, Optional
+
+# Incremental mode: every comment carries the Apify comment id (`source_id`)
+# and a hash of its raw text (`content_hash`). The ledger remembers which
+# (source_id, content_hash) pairs have been fully handled -- either dropped
+# by filter_comments or loaded into the DB -- so later runs only process new
+# or edited comments. Records without a source_id are never recorded: the
+# ledger is shared by every video, and a bare text hash would match the same
+# short comment ("love it") on any other video.
+
+LEDGER_PATH = "processed_comments.json"
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha1((text or "").encode("utf-8")).hexdigest()
+
+
+def _clean(value):
+    # Values that round-tripped through pandas may be NaN instead of None
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    return str(value)
+
+
+def comment_key(record: Dict) -> Optional[str]:
+    source_id = _clean(record.get("source_id"))
+    if not source_id:
+        return None
+    return f"{source_id}:{_clean(record.get('content_hash')) or content_hash(record.get('text'))}"
+
+
+class ProcessedLedger:
+    def __init__(self, path=LEDGER_PATH):
+        self.path = path
+        self.keys = set()
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.keys = set(json.load(f))
+
+    def __contains__(self, record: Dict) -> bool:
+        key = comment_key(record)
+        return key is not None and key in self.keys
+
+    def add(self, records: Iterable[Dict]):
+        self.keys.update(key for key in map(comment_key, records) if key is not None)
+
+    def save(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(sorted(self.keys), f)
+        os.replace(tmp_path, self.path)
+
+
+def select_new_comments(comments: Iterable[Dict], ledger: ProcessedLedger) -> Iterator[Dict]:
+    """Drop comments the ledger has already seen with the same content."""
+    for record in comments:
+        if record not in ledger:
+            yield record
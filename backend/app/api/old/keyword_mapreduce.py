@@ -0,0 +1,117 @@
+import re
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional
+
+from dedupe import cluster_phrases
+from grammar import get_ollama_client
+from llm_cache import DiskCache, content_key
+
+KEYWORD_MODEL = "llama3"
+CHUNK_TOKEN_BUDGET = 1500
+KEYWORDS_PER_CHUNK = 20
+MIN_KEYWORDS_PER_CHUNK = 5
+MAX_CHUNK_RETRIES = 3
+KEYWORD_WORKERS = 4
+
+
+def approx_tokens(text: str) -> int:
+    # ~4 characters per token for English; avoids loading a tokenizer just to chunk
+    return len(text) // 4 + 1
+
+
+def chunk_by_token_budget(comments: List[str], budget=CHUNK_TOKEN_BUDGET,
+                          count_tokens: Callable[[str], int] = approx_tokens) -> List[List[str]]:
+    """Greedy, order-preserving chunks whose estimated token count stays within `budget`."""
+    chunks, current, used = [], [], 0
+    for comment in comments:
+        cost = count_tokens(comment)
+        if current and used + cost > budget:
+            chunks.append(current)
+            current, used = [], 0
+        current.append(comment)
+        used += cost
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def parse_keywords(response: str) -> List[str]:
+    return [kw.strip().lower() for kw in re.findall(r'"(.*?)"', response) if kw.strip()]
+
+
+def default_llm(model=KEYWORD_MODEL):
+    client = get_ollama_client()
+
+    def run(prompt):
+        response = client.chat(model=model, messages=[{"role": "user", "content": prompt}])
+        return response["message"]["content"].strip()
+
+    return run
+
+
+def extract_chunk_keywords(chunk: List[str], template: str, llm: Callable[[str], str],
+                           cache: DiskCache, model=KEYWORD_MODEL, length=KEYWORDS_PER_CHUNK,
+                           min_keywords=MIN_KEYWORDS_PER_CHUNK, max_retries=MAX_CHUNK_RETRIES) -> List[str]:
+    """Map step: candidate keywords for one chunk, cached by (model, template, chunk)."""
+    key = content_key(model, template, length, chunk)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    prompt = template.format(comment_list=chunk, length=length)
+    best = []
+    for attempt in range(max_retries):
+        try:
+            keywords = parse_keywords(llm(prompt))
+        except Exception as e:
+            print(f"⚠️ Keyword chunk attempt {attempt + 1} failed ({e})")
+            continue
+        if len(keywords) > len(best):
+            best = keywords
+        if len(best) >= min_keywords:
+            break
+
+    # Only cache answers that met the bar, so weak chunks get another try next run
+    if len(best) >= min_keywords:
+        cache.set(key, best)
+    return best
+
+
+def reduce_keywords(chunk_keywords: List[List[str]], encode: Callable[[List[str]], object],
+                    top_k=20, threshold=0.85) -> List[str]:
+    """
+    Reduce step: count in how many chunks each candidate appears, merge
+    near-duplicates by embedding similarity, and rank clusters by total count.
+    """
+    frequency = Counter(kw for keywords in chunk_keywords for kw in set(keywords))
+    if not frequency:
+        return []
+
+    candidates = [kw for kw, _ in frequency.most_common()]
+    mapping = cluster_phrases(candidates, encode(candidates), threshold,
+                              weights=[frequency[kw] for kw in candidates])
+
+    cluster_counts = Counter()
+    for kw in candidates:
+        cluster_counts[mapping[kw]] += frequency[kw]
+    return [kw for kw, _ in cluster_counts.most_common(top_k)]
+
+
+def extract_keywords_map_reduce(comments: List[str], template: str, encode: Callable[[List[str]], object],
+                                llm: Optional[Callable[[str], str]] = None, model=KEYWORD_MODEL,
+                                budget=CHUNK_TOKEN_BUDGET, top_k=20, max_workers=KEYWORD_WORKERS,
+                                cache: DiskCache = None) -> List[str]:
+    chunks = chunk_by_token_budget(comments, budget)
+    print(f"🔍 Extracting keywords from {len(comments)} comments in {len(chunks)} chunks...")
+
+    llm = llm or default_llm(model)
+    cache = cache or DiskCache("keywords")
+
+    def run(chunk):
+        return extract_chunk_keywords(chunk, template, llm, cache, model)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        chunk_keywords = list(pool.map(run, chunks))
+
+    return reduce_keywords(chunk_keywords, encode, top_k)
@@ -0,0 +1,91 @@
+import os
+import re
+import json
+import hashlib
+import pandas as pd
+from langdetect import DetectorFactory, detect
+
+# langdetect is randomized unless seeded
+DetectorFactory.seed = 0
+
+LANG_CACHE_PATH = "lang_cache.json"
+LANG_UNKNOWN = "unknown"
+WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_for_detection(text) -> str:
+    if not isinstance(text, str):
+        return ""
+    return WHITESPACE_RE.sub(" ", text).strip().lower()
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class LanguageCache:
+    """Detected languages keyed by hash of the normalized text, persisted as JSON."""
+
+    def __init__(self, path=LANG_CACHE_PATH):
+        self.path = path
+        self.entries = {}
+        self.dirty = False
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f)
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def set(self, key, lang):
+        self.entries[key] = lang
+        self.dirty = True
+
+    def save(self):
+        if not self.path or not self.dirty:
+            return
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+
+def detect_language(text, cache: LanguageCache = None) -> str:
+    """Language code for `text`; "" for empty text, LANG_UNKNOWN if detection fails."""
+    normalized = normalize_for_detection(text)
+    if not normalized:
+        return ""
+
+    key = text_hash(normalized)
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    try:
+        lang = detect(normalized)
+    except Exception:
+        lang = LANG_UNKNOWN
+
+    if cache is not None:
+        cache.set(key, lang)
+    return lang
+
+
+def add_language_column(df: pd.DataFrame, text_column="text", column="lang",
+                        cache_path=LANG_CACHE_PATH) -> pd.DataFrame:
+    """Detect each unique normalized text once and store the result in `df[column]`."""
+    cache = LanguageCache(cache_path)
+    normalized = df[text_column].map(normalize_for_detection)
+
+    langs = {text: detect_language(text, cache) for text in normalized.unique()}
+    df[column] = normalized.map(langs)
+
+    cache.save()
+    return df
+
+
+def non_english_mask(langs: pd.Series) -> pd.Series:
+    """True for rows detected as anything but English (empty texts are kept)."""
+    return langs.ne("en") & langs.ne("")
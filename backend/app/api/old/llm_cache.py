@@ -0,0 +1,45 @@
+import os
+import json
+import hashlib
+
+LLM_CACHE_DIR = os.environ.get("LLM_CACHE_DIR", "llm_cache")
+
+
+def content_key(*parts) -> str:
+    """Stable SHA-256 over the parts that determine an LLM answer (model, prompt version, input)."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(json.dumps(part, ensure_ascii=False, sort_keys=True).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class DiskCache:
+    """
+    Content-addressed JSON store: one file per key under `<root>/<namespace>/ab/abcdef...json`.
+    Writes go through a temp file + rename so concurrent workers never see partial entries.
+    """
+
+    def __init__(self, namespace, root=LLM_CACHE_DIR):
+        self.dir = os.path.join(root, namespace)
+
+    def _path(self, key):
+        return os.path.join(self.dir, key[:2], f"{key}.json")
+
+    def get(self, key):
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def set(self, key, value):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{id(value)}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(value, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
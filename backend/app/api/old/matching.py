@@ -0,0 +1,49 @@
+import numpy as np
+
+MATCH_CHUNK_SIZE = 4096
+
+
+def l2_normalize(embeddings):
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    return embeddings / np.maximum(norms, 1e-12)
+
+
+def match_chunk(comment_embeddings, keyword_embeddings, threshold):
+    """
+    Threshold one block of normalized comment embeddings against all normalized
+    keyword embeddings with a single matrix product.
+
+    Returns (rows, cols, scores) for every pair with cosine >= threshold,
+    ordered by row and then by descending score.
+    """
+    sims = comment_embeddings @ keyword_embeddings.T
+    rows, cols = np.nonzero(sims >= threshold)
+    scores = sims[rows, cols]
+
+    order = np.lexsort((-scores, rows))
+    return rows[order], cols[order], scores[order]
+
+
+def group_matches(n_rows, rows, cols, scores):
+    """Per-row list of (keyword index, score) from flat match arrays."""
+    grouped = [[] for _ in range(n_rows)]
+    for r, c, s in zip(rows.tolist(), cols.tolist(), scores.tolist()):
+        grouped[r].append((c, s))
+    return grouped
+
+
+def iter_matches(encode_chunk, texts, keyword_embeddings, threshold, chunk_size=MATCH_CHUNK_SIZE):
+    """
+    Stream matches for `texts` chunk by chunk so only `chunk_size` comment
+    embeddings and one chunk_size x n_keywords similarity block are held at once.
+
+    `encode_chunk(list_of_texts)` must return an (n, dim) array. Yields one list
+    of (keyword index, score) per text, in order.
+    """
+    keyword_embeddings = l2_normalize(keyword_embeddings)
+    for start in range(0, len(texts), chunk_size):
+        chunk = texts[start:start + chunk_size]
+        comment_embeddings = l2_normalize(encode_chunk(chunk))
+        rows, cols, scores = match_chunk(comment_embeddings, keyword_embeddings, threshold)
+        yield from group_matches(len(chunk), rows, cols, scores)
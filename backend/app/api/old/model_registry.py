@@ -0,0 +1,97 @@
+import time
+import threading
+from typing import Callable, Dict, Iterable, Optional
+
+# Process-wide, lazily loaded ML models. Only stdlib imports live at module
+# level so importing this file (from the pipeline scripts or from the FastAPI
+# app as app.api.old.model_registry) never pulls in torch on its own.
+
+SENTIMENT_MODEL_NAME = "cardiffnlp/twitter-roberta-base-sentiment"
+EMBEDDING_MODEL_NAME = "all-MiniLM-L6-v2"
+
+
+class ModelRegistry:
+    def __init__(self):
+        self._loaders: Dict[str, Callable[[], object]] = {}
+        self._models: Dict[str, object] = {}
+        self._metrics: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, loader: Callable[[], object]):
+        """Register a zero-argument loader; nothing is loaded until first get()."""
+        with self._lock:
+            self._loaders.setdefault(name, loader)
+
+    def get(self, name: str):
+        model = self._models.get(name)
+        if model is not None:
+            return model
+
+        with self._lock:
+            # Another thread may have finished loading while we waited
+            if name in self._models:
+                return self._models[name]
+            if name not in self._loaders:
+                raise KeyError(f"No model registered under '{name}'")
+
+            start = time.perf_counter()
+            model = self._loaders[name]()
+            elapsed = time.perf_counter() - start
+
+            self._models[name] = model
+            self._metrics[name] = {"load_seconds": round(elapsed, 3), "loaded_at": time.time()}
+            print(f"✅ Loaded model '{name}' in {elapsed:.2f}s")
+            return model
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._models
+
+    def warm_up(self, names: Optional[Iterable[str]] = None):
+        """Load the given (or all registered) models now rather than on first use."""
+        for name in list(names or self._loaders):
+            self.get(name)
+
+    def metrics(self) -> Dict[str, dict]:
+        return {
+            name: {"loaded": name in self._models, **self._metrics.get(name, {})}
+            for name in self._loaders
+        }
+
+
+registry = ModelRegistry()
+
+
+def _load_sentiment_model():
+    from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+    tokenizer = AutoTokenizer.from_pretrained(SENTIMENT_MODEL_NAME)
+    model = AutoModelForSequenceClassification.from_pretrained(SENTIMENT_MODEL_NAME)
+    model.eval()
+    return tokenizer, model
+
+
+def _embedding_key(model_name: str) -> str:
+    return f"embedding:{model_name}"
+
+
+def register_embedding_model(model_name: str = EMBEDDING_MODEL_NAME) -> str:
+    def load():
+        from sentence_transformers import SentenceTransformer
+        return SentenceTransformer(model_name)
+
+    key = _embedding_key(model_name)
+    registry.register(key, load)
+    return key
+
+
+registry.register("sentiment", _load_sentiment_model)
+register_embedding_model(EMBEDDING_MODEL_NAME)
+
+
+def get_sentiment_model():
+    """(tokenizer, model) for the RoBERTa sentiment classifier."""
+    return registry.get("sentiment")
+
+
+def get_embedding_model(model_name: str = EMBEDDING_MODEL_NAME):
+    return registry.get(register_embedding_model(model_name))
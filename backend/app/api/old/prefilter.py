@@ -0,0 +1,61 @@
+import re
+import pandas as pd
+from nltk import pos_tag_sents, word_tokenize
+
+# === Precompiled patterns shared by the vectorized filters ===
+MENTION_ONLY_RE = re.compile(r"(?:@\S+\s*)+")
+MENTION_RE = re.compile(r"@\S+")
+
+QUESTION_STARTERS = (
+    "how", "has", "where", "when", "why", "who", "what", "which", "can", "could", "do", "does", "did", "is", "are", "should", "would"
+)
+# Same as `text.split()[0] in QUESTION_STARTERS`: starter followed by whitespace or end
+QUESTION_STARTER_RE = re.compile(r"(?:%s)(?:\s|$)" % "|".join(QUESTION_STARTERS))
+
+QUESTION_POS_PATTERN = ["MD", "PRP", "VB"]
+POS_WINDOW = 10
+# The perceptron tagger looks two tokens ahead, so tagging a few extra tokens
+# gives the same tags for the first POS_WINDOW tokens as tagging the full text.
+POS_LOOKAHEAD = 2
+
+
+def mention_only_mask(texts: pd.Series) -> pd.Series:
+    """True where the entire comment is just mentions and whitespace."""
+    return texts.eq("@") | texts.str.strip().str.fullmatch(MENTION_ONLY_RE).fillna(False).astype(bool)
+
+
+def strip_mentions_series(texts: pd.Series) -> pd.Series:
+    """Remove all @mentions from every comment."""
+    return texts.str.replace(MENTION_RE, "", regex=True).str.strip()
+
+
+def has_question_pos_pattern(tags) -> bool:
+    short_seq = tags[:POS_WINDOW]
+    for i in range(len(short_seq) - 2):
+        if short_seq[i:i+3] == QUESTION_POS_PATTERN:
+            return True
+    return False
+
+
+def question_mask(texts: pd.Series) -> pd.Series:
+    """
+    Vectorized is_question: the regex rules run over the whole Series, and POS
+    tagging runs once, batched, on the rows the regex rules could not decide.
+    """
+    normalized = texts.fillna("").str.strip().str.lower()
+
+    mask = normalized.str.endswith("?") | normalized.str.match(QUESTION_STARTER_RE).astype(bool)
+
+    residual = normalized[~mask & normalized.ne("")]
+    if residual.empty:
+        return mask
+
+    try:
+        token_lists = [word_tokenize(text)[:POS_WINDOW + POS_LOOKAHEAD] for text in residual]
+        tagged = pos_tag_sents(token_lists)
+        pos_hits = [has_question_pos_pattern([tag for _, tag in sent]) for sent in tagged]
+        mask.loc[residual.index] = pos_hits
+    except Exception as e:
+        print(f"⚠️ POS question check skipped: {e}")
+
+    return mask
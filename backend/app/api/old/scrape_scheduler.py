@@ -0,0 +1,154 @@
+import os
+import re
+import json
+import time
+import random
+import asyncio
+import hashlib
+from typing import Dict, List
+
+# Kept free of the heavy NLP imports in scraping.py so the scheduler can be
+# benchmarked offline against a stub client.
+
+ACTOR_ID = "BDec00yAmCm1QbMEI"
+TERMINAL_STATUSES = {"SUCCEEDED", "FAILED", "ABORTED", "TIMED-OUT"}
+MAX_RUN_SECONDS = 600  # give up on (and abort) an actor run that has not finished by then
+
+
+class ScrapeError(Exception):
+    pass
+
+
+def get_actor_input(url, comments_per_post=1000):
+    return {
+        "postURLs": [url],
+        "commentsPerPost": comments_per_post,
+        "maxRepliesPerComment": 0,
+        "resultsPerPage": comments_per_post,
+    }
+
+
+def get_async_apify_client():
+    from apify_client import ApifyClientAsync
+
+    api_token = os.environ.get("APIFY_API_TOKEN")
+    if not api_token:
+        raise EnvironmentError("⚠️ APIFY_API_TOKEN is not set in environment variables.")
+    return ApifyClientAsync(api_token)
+
+
+def video_output_path(url, output_dir):
+    """One NDJSON file per video, named by TikTok video id when present."""
+    match = re.search(r"/video/(\d+)", url)
+    name = match.group(1) if match else hashlib.sha1(url.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(output_dir, f"comments_{name}.ndjson")
+
+
+async def wait_for_run(client, run_id, poll_interval=5.0, max_wait=MAX_RUN_SECONDS):
+    deadline = time.monotonic() + max_wait
+    status = None
+    while time.monotonic() < deadline:
+        run = await client.run(run_id).get()
+        status = run.get("status") if run else None
+        if status in TERMINAL_STATUSES:
+            return run
+        await asyncio.sleep(min(poll_interval, max(deadline - time.monotonic(), 0)))
+    raise ScrapeError(f"Actor run {run_id} still {status or 'pending'} after {max_wait:.0f}s")
+
+
+async def abort_run(client, run_id):
+    """Stop a run we are giving up on, so a retry does not leave a paid run behind."""
+    try:
+        await client.run(run_id).abort()
+        print(f"🛑 Aborted actor run {run_id}")
+    except Exception as e:
+        print(f"⚠️ Could not abort actor run {run_id} ({e})")
+
+
+async def stream_dataset(client, dataset_id, output_file):
+    count = 0
+    tmp_file = output_file + ".part"
+    try:
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            async for item in client.dataset(dataset_id).iterate_items():
+                f.write(json.dumps(item, ensure_ascii=False))
+                f.write("\n")
+                count += 1
+        os.replace(tmp_file, output_file)
+    finally:
+        # Only left behind if streaming failed part-way
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+    return count
+
+
+async def scrape_video(client, url, output_dir, semaphore,
+                       max_retries=3, backoff_base=2.0, poll_interval=5.0,
+                       comments_per_post=1000, max_wait=MAX_RUN_SECONDS):
+    """Run the actor for one video and stream its dataset to disk, retrying with backoff."""
+    output_file = video_output_path(url, output_dir)
+    last_error = None
+
+    for attempt in range(max_retries + 1):
+        if attempt:
+            delay = backoff_base * (2 ** (attempt - 1))
+            await asyncio.sleep(delay + random.uniform(0, delay / 2))
+
+        run = None
+        try:
+            async with semaphore:
+                run = await client.actor(ACTOR_ID).start(run_input=get_actor_input(url, comments_per_post))
+                run = await wait_for_run(client, run["id"], poll_interval, max_wait)
+                if run["status"] != "SUCCEEDED":
+                    raise ScrapeError(f"Actor run {run['id']} ended with status {run['status']}")
+                count = await stream_dataset(client, run["defaultDatasetId"], output_file)
+
+            print(f"✅ {url}: {count} items -> {output_file}")
+            return {"url": url, "path": output_file, "items": count, "attempts": attempt + 1}
+        except Exception as e:
+            last_error = e
+            print(f"⚠️ {url}: attempt {attempt + 1} failed ({e})")
+            if run and run.get("status") not in TERMINAL_STATUSES:
+                await abort_run(client, run["id"])
+
+    return {"url": url, "path": None, "items": 0, "attempts": max_retries + 1, "error": str(last_error)}
+
+
+async def scrape_videos(urls: List[str], output_dir="scraped", client=None,
+                        concurrency=5, max_retries=3, backoff_base=2.0,
+                        poll_interval=5.0, comments_per_post=1000,
+                        max_wait=MAX_RUN_SECONDS) -> List[Dict]:
+    """
+    Fan out one actor run per video with at most `concurrency` runs in flight.
+    Runs still unfinished after `max_wait` seconds are aborted and retried.
+    Returns one result dict per unique URL, in input order.
+    """
+    client = client or get_async_apify_client()
+    os.makedirs(output_dir, exist_ok=True)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    tasks = [
+        scrape_video(client, url, output_dir, semaphore, max_retries,
+                     backoff_base, poll_interval, comments_per_post, max_wait)
+        for url in dict.fromkeys(urls)
+    ]
+    return await asyncio.gather(*tasks)
+
+
+def run_scheduler(urls, **kwargs):
+    start = time.perf_counter()
+    results = asyncio.run(scrape_videos(urls, **kwargs))
+    elapsed = time.perf_counter() - start
+
+    failed = [r for r in results if r.get("error")]
+    print(f"Scraped {len(results) - len(failed)}/{len(results)} videos in {elapsed:.1f}s")
+    return results
+
+
+if __name__ == "__main__":
+    import sys
+
+    # python scrape_scheduler.py urls.txt
+    with open(sys.argv[1], "r", encoding="utf-8") as f:
+        video_urls = [line.strip() for line in f if line.strip()]
+    run_scheduler(video_urls)
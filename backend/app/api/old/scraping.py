@@ -1,20 +1,27 @@
 import os
+import sys
 import json
-import re
 import ollama
 import nltk
+from nltk import pos_tag, word_tokenize
 import pandas as pd
 from typing import List, Dict
-import argostranslate.package
-from langdetect import detect
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
 from apify_client import ApifyClient
 
 from sentiment_analysis import *
-
-# Load once at the top
-tokenizer = AutoTokenizer.from_pretrained("cardiffnlp/twitter-roberta-base-sentiment")
-model = AutoModelForSequenceClassification.from_pretrained("cardiffnlp/twitter-roberta-base-sentiment")
+from prefilter import (
+    MENTION_ONLY_RE,
+    MENTION_RE,
+    QUESTION_STARTERS,
+    has_question_pos_pattern,
+    mention_only_mask,
+    strip_mentions_series,
+    question_mask,
+)
+from grammar import fix_grammar_batch
+from language_id import add_language_column, detect_language, non_english_mask
+from translation import get_translation_registry
+from incremental import ProcessedLedger, content_hash, select_new_comments
 
 
 def save_to_json(results, output_file):
@@ -31,13 +38,16 @@ def get_actor_input(url):
     }
     return run_input
 
-def scrape_to_json(url):
+def get_apify_client():
     api_token = os.environ.get("APIFY_API_TOKEN")
 
     if not api_token:
         raise EnvironmentError("⚠️ APIFY_API_TOKEN is not set in environment variables.")
 
-    client = ApifyClient(api_token)
+    return ApifyClient(api_token)
+
+def scrape_to_json(url):
+    client = get_apify_client()
     run_input = get_actor_input(url)
 
     print("Running the Actor and waiting for it to finish...")
@@ -53,30 +63,71 @@ def scrape_to_json(url):
     save_to_json(results, output_file)
     print(f"Saved {len(results)} items to {output_file}")
 
-def get_comments_data(json_path="tiktok_apify_comments.json"):
-    if not os.path.exists(json_path):
-        raise FileNotFoundError(f"JSON file not found: {json_path}")
+def write_ndjson(items, output_file):
+    """Write items one JSON object per line as they arrive; returns the count written."""
+    count = 0
+    with open(output_file, "w", encoding="utf-8") as f:
+        for item in items:
+            f.write(json.dumps(item, ensure_ascii=False))
+            f.write("\n")
+            count += 1
+    return count
+
+def scrape_to_ndjson(url, output_file="tiktok_apify_comments.ndjson", client=None):
+    """
+    Streaming variant of scrape_to_json: dataset items are written to NDJSON
+    as iterate_items() yields them, so memory stays flat regardless of size.
+    Pass `client` to run against a stub instead of the real Apify API.
+    """
+    client = client or get_apify_client()
+    run_input = get_actor_input(url)
+
+    print("Running the Actor and waiting for it to finish...")
+    run = client.actor("BDec00yAmCm1QbMEI").call(run_input=run_input)
+    print("Actor finished.")
+
+    print("Streaming results...")
+    count = write_ndjson(client.dataset(run["defaultDatasetId"]).iterate_items(), output_file)
+    print(f"Saved {count} items to {output_file}")
+    return output_file
 
+def iter_raw_items(json_path):
+    """Yield raw Apify items from an NDJSON file, or from a legacy JSON array file."""
     with open(json_path, "r", encoding="utf-8") as f:
-        raw_data = json.load(f)
+        if json_path.endswith((".ndjson", ".jsonl")):
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+        else:
+            yield from json.load(f)
 
-    comments = []
+def clean_comment_text(comment_text):
+    comment_text = comment_text.encode("ascii", "ignore").decode()
+    comment_text = comment_text.lower()
+    comment_text = comment_text.strip('“”‘’"\'')
+    return comment_text
 
-    for item in raw_data:
+def iter_clean_comments(items):
+    """Clean raw Apify items one at a time, yielding {"text", "source_id", "content_hash"} records."""
+    for item in items:
         comment_text = item.get("text")
-        
+
         if not comment_text:
             continue
-        else:
-            comment_text = comment_text.encode("ascii", "ignore").decode()
-            comment_text = comment_text.lower()
-            comment_text = comment_text.strip('“”‘’"\'')
 
-        comments.append({
-            "text": comment_text,
-        })
+        yield {
+            "text": clean_comment_text(comment_text),
+            "source_id": item.get("cid"),
+            "content_hash": content_hash(comment_text),
+        }
+
+def get_comments_data(json_path="tiktok_apify_comments.json"):
+    """Return a generator of cleaned comments; the file is read lazily, record by record."""
+    if not os.path.exists(json_path):
+        raise FileNotFoundError(f"JSON file not found: {json_path}")
 
-    return comments
+    return iter_clean_comments(iter_raw_items(json_path))
 
 def fix_grammar(comment):
     prompt = f'fix the grammar, punctuation, and spelling in this sentence. Only give me back the corrected sentence, no justification or notes: {comment}'
@@ -99,12 +150,12 @@ def is_only_mention(text: str) -> bool:
     if text == "@":
         return True
     text = text.strip()
-    return re.fullmatch(r"(?:@\S+\s*)+", text) is not None
+    return MENTION_ONLY_RE.fullmatch(text) is not None
 
 def strip_mentions(text: str) -> str:
     """Remove all @mentions from the text, only if there's more than just mentions."""
     
-    return re.sub(r"@\S+", "", text).strip()
+    return MENTION_RE.sub("", text).strip()
 
 # === Helper: Check if a comment is a question (POS + regex) ===
 def is_question(text: str) -> bool:
@@ -115,59 +166,55 @@ def is_question(text: str) -> bool:
         return True
 
     # === Rule 2: starts with common question words ===
-    question_starters = (
-        "how", "has", "where", "when", "why", "who", "what", "which", "can", "could", "do", "does", "did", "is", "are", "should", "would"
-    )
-    first_word = text.split()[0] if text.split() else ""
-    if first_word in question_starters:
+    words = text.split()
+    first_word = words[0] if words else ""
+    if first_word in QUESTION_STARTERS:
         return True
 
     # === Rule 3: POS pattern check ONLY on first few tokens ===
     try:
         tokens = word_tokenize(text)
         tags = [tag for _, tag in pos_tag(tokens)]
-
-        # Check first 10 tokens only
-        short_seq = tags[:10]
-        for i in range(len(short_seq) - 2):
-            if short_seq[i:i+3] == ["MD", "PRP", "VB"]:
-                return True
+        if has_question_pos_pattern(tags):
+            return True
     except Exception:
         pass
 
     return False
 
 # === MAIN FUNCTION ===
-def filter_comments(all_comments: List[Dict]) -> pd.DataFrame:
-    df = pd.DataFrame(all_comments)
+def filter_comments(all_comments: List[Dict], ledger: ProcessedLedger = None) -> pd.DataFrame:
+    df = pd.DataFrame(all_comments, columns=["text", "source_id", "content_hash"])
 
     print(f"Initial comments: {len(df)}")
     df["text"] = df["text"].str.lower()
 
     # === Step 1: Remove @mention-only comments ===
     
-    mention_only_mask = df["text"].apply(is_only_mention)
-    mention_only_comments = df[mention_only_mask]
-    df = df[~mention_only_mask]
+    mention_mask = mention_only_mask(df["text"])
+    mention_only_comments = df[mention_mask]
+    df = df[~mention_mask]
     print(f"Removed @mention-only: {len(mention_only_comments)}")
 
 
     # STEP 3: Optionally, drop rows that became empty after mention stripping
-    df["text"] = df["text"].apply(strip_mentions)
+    df["text"] = strip_mentions_series(df["text"])
     print(df["text"])
 
-    non_english_mask = df["text"].apply(is_non_english)
-    non_english_comments = df[non_english_mask]
-    df = df[~non_english_mask]
+    # Detect once per unique text; translation can reuse df["lang"]
+    df = add_language_column(df)
+    non_english = non_english_mask(df["lang"])
+    non_english_comments = df[non_english]
+    df = df[~non_english]
     print(f"Removed non-English: {len(non_english_comments)}")
 
     # TODO: REMOVE THIS IF NOT NEEDED!
-    df["text"] = df["text"].apply(fix_grammar)
+    df["text"] = fix_grammar_batch(df["text"].tolist())
 
     # === Step 2: Remove question-style comments ===
-    question_mask = df["text"].apply(is_question)
-    question_comments = df[question_mask]
-    df = df[~question_mask]
+    questions = question_mask(df["text"])
+    question_comments = df[questions]
+    df = df[~questions]
     print(f"Removed questions: {len(question_comments)}")
 
     # === Step 3: Use LLM for relevance filtering ===
@@ -182,11 +229,12 @@ def filter_comments(all_comments: List[Dict]) -> pd.DataFrame:
 
     
     # print(f"Translating Comments")
-    # df["translated_text"] = df["text"].apply(translate_comment)
+    # from translation import translate_texts
+    # df["translated_text"] = translate_texts(df["text"].tolist(), df["lang"].tolist())
 
     # df.to_csv("translated_comments.csv", index=False)
 
-    df["sentiment"] = df["text"].apply(get_sentiment)
+    df = add_sentiment_columns(df)
 
     # === Optionally save removed comments for inspection ===
     mention_only_comments.to_csv("filtered_mentions.csv", index=False)
@@ -195,56 +243,36 @@ def filter_comments(all_comments: List[Dict]) -> pd.DataFrame:
     df.to_csv("final_comments.csv", index=False)
     # irrelevant_comments.to_csv("filtered_irrelevant.csv", index=False)
 
+    # Dropped comments are finished; kept ones are recorded once they reach the DB
+    if ledger is not None:
+        for dropped in (mention_only_comments, non_english_comments, question_comments):
+            ledger.add(dropped.to_dict(orient="records"))
+        ledger.save()
+
     print(f"Final kept comments: {len(df)}")
     return df
 
 def install_language_pair_if_needed(source_lang, target_lang="en"):
-    installed_languages = argostranslate.translate.get_installed_languages()
-
-    for lang in installed_languages:
-        if lang.code == source_lang:
-            for translation in lang.translations:
-                if translation.to_lang.code == target_lang:
-                    return  # Already installed
-
-    # Download and install if not found
-    available_packages = argostranslate.package.get_available_packages()
-    for pkg in available_packages:
-        if pkg.from_code == source_lang and pkg.to_code == target_lang:
-            download_path = pkg.download()
-            argostranslate.package.install_from_path(download_path)
-            print(f"✅ Installed translation model: {source_lang} → {target_lang}")
-            return
-
-    print(f"⚠️ No translation model available for: {source_lang} → {target_lang}")
+    # Resolution (and install, if missing) is cached per pair by the registry
+    get_translation_registry().get(source_lang, target_lang)
 
 def is_non_english(text):
     if not isinstance(text, str) or not text.strip():
             return text
 
-    try:
-        lang_code = detect(text)
-        return lang_code != "en"
-    except Exception as e:
-        return True
+    return detect_language(text) != "en"
 
-def translate_comment(text):
+def translate_comment(text, lang_code=None):
     try:
         if not isinstance(text, str) or not text.strip():
             return text
 
-        lang_code = detect(text)
+        lang_code = lang_code or detect_language(text)
         if lang_code == "en":
             return text  # Already English
 
-        install_language_pair_if_needed(lang_code, "en")
-
-        installed_languages = argostranslate.translate.get_installed_languages()
-        from_lang = next((lang for lang in installed_languages if lang.code == lang_code), None)
-        to_lang = next((lang for lang in installed_languages if lang.code == "en"), None)
-
-        if from_lang and to_lang:
-            translation = from_lang.get_translation(to_lang)
+        translation = get_translation_registry().get(lang_code, "en")
+        if translation:
             return translation.translate(text)
 
     except Exception as e:
@@ -259,5 +287,13 @@ if __name__ == "__main__":
     nltk.download('averaged_perceptron_tagger')
     # scrape_to_json(url = "https://www.tiktok.com/@sarahpalmyra/video/7086537682649697578?_r=1&_t=ZT-8yKbPxtxrLi") # uncomment this to add a new url and scrape the comments from that TikTok. 
 
-    comments = get_comments_data()
-    filter_comments(comments)
+    # python scraping.py --incremental  -> only comments not seen by a previous run
+    if "--incremental" in sys.argv:
+        ledger = ProcessedLedger()
+        comments = list(select_new_comments(get_comments_data(), ledger))
+        print(f"Incremental mode: {len(comments)} new or edited comments")
+        if comments:
+            filter_comments(comments, ledger=ledger)
+    else:
+        comments = get_comments_data()
+        filter_comments(comments)
@@ -1,16 +1,18 @@
 import torch
 import numpy as np
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
+from typing import List, Dict, Optional
+from model_registry import SENTIMENT_MODEL_NAME, get_sentiment_model
 
-MODEL_NAME = "cardiffnlp/twitter-roberta-base-sentiment"
-
-tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
-model = AutoModelForSequenceClassification.from_pretrained(MODEL_NAME)
+MODEL_NAME = SENTIMENT_MODEL_NAME
 
 LABELS = ["negative", "neutral", "positive"]
 
+SENTIMENT_BATCH_SIZE = 32
+MAX_TOKENS = 512
+
 def get_sentiment(text: str) -> str:
     try:
+        tokenizer, model = get_sentiment_model()
         inputs = tokenizer(text[:512], return_tensors="pt", truncation=True)
         with torch.no_grad():
             logits = model(**inputs).logits
@@ -19,3 +21,64 @@ def get_sentiment(text: str) -> str:
     except Exception as e:
         print(f"Error during sentiment analysis: {e}")
         return "neutral"
+
+def _neutral_result() -> Dict:
+    return {"label": "neutral", "scores": {"negative": 0.0, "neutral": 1.0, "positive": 0.0}}
+
+def get_sentiments(texts: List[str],
+                   batch_size: int = SENTIMENT_BATCH_SIZE,
+                   num_threads: Optional[int] = None) -> List[Dict]:
+    """
+    Score many texts in a few forward passes.
+
+    Texts are sorted by token length and split into mini-batches, so each batch
+    is padded only to its own longest member. Results come back in input order
+    as {"label": ..., "scores": {label: probability}}.
+    """
+    if num_threads:
+        torch.set_num_threads(num_threads)
+
+    results: List[Dict] = [_neutral_result() for _ in texts]
+    valid = [i for i, t in enumerate(texts) if isinstance(t, str) and t.strip()]
+    if not valid:
+        return results
+
+    tokenizer, model = get_sentiment_model()
+
+    # Tokenize once without padding to get lengths for bucketing
+    encoded = tokenizer(
+        [texts[i] for i in valid],
+        truncation=True,
+        max_length=MAX_TOKENS,
+    )["input_ids"]
+    order = sorted(range(len(valid)), key=lambda k: len(encoded[k]))
+
+    for start in range(0, len(order), batch_size):
+        bucket = order[start:start + batch_size]
+        features = [{"input_ids": encoded[k]} for k in bucket]
+        try:
+            inputs = tokenizer.pad(features, padding="longest", return_tensors="pt")
+            with torch.no_grad():
+                logits = model(**inputs).logits
+            probs = torch.nn.functional.softmax(logits, dim=1).numpy()
+        except Exception as e:
+            print(f"Error during batched sentiment analysis: {e}")
+            continue
+
+        for k, row in zip(bucket, probs):
+            results[valid[k]] = {
+                "label": LABELS[int(np.argmax(row))],
+                "scores": {label: float(p) for label, p in zip(LABELS, row)},
+            }
+
+    return results
+
+def add_sentiment_columns(df, text_column: str = "text",
+                          batch_size: int = SENTIMENT_BATCH_SIZE,
+                          num_threads: Optional[int] = None):
+    """Attach `sentiment` plus per-label probability columns to a DataFrame."""
+    results = get_sentiments(df[text_column].tolist(), batch_size=batch_size, num_threads=num_threads)
+    df["sentiment"] = [r["label"] for r in results]
+    for label in LABELS:
+        df[f"sentiment_{label}"] = [r["scores"][label] for r in results]
+    return df
@@ -1,26 +1,30 @@
+import sys
 import pandas as pd
 import ollama
 import re
 import json
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
+from matching import MATCH_CHUNK_SIZE, iter_matches
+from embedding_store import cached_encoder
+from incremental import ProcessedLedger
+from dedupe import canonical_phrases, cluster_phrases
+from keyword_mapreduce import MAX_CHUNK_RETRIES, extract_keywords_map_reduce
 
 from sentiment_analysis import *
-from db_loader import (
-    load_comments_to_db, 
-    load_graph_data_to_db
-)
-from db_graph_utils import (  # 👈 your new file with DB graph builders
+from model_registry import EMBEDDING_MODEL_NAME, get_embedding_model
+from db_utils import (
+    load_comments_to_db_bulk,
+    get_video_keyword_texts,
+    get_keyword_usage_counts,
+    merge_keywords,
     build_graph_from_db,
-    add_llm_links,
-    save_graph_to_json
+    save_graph_to_json,
+    load_graph_data_to_db
 )
 
 # ------------------------
 # CONFIG
 # ------------------------
 
-EMBEDDING_MODEL_NAME = 'all-MiniLM-L6-v2'
 SIMILARITY_THRESHOLD = 0.5
 BORDERLINE_THRESHOLD = 0.4
 
@@ -48,7 +52,7 @@ def extract_keywords_llm_helper(comments):
     return keywords
 
 
-def extract_keywords_llm():
+def extract_keywords_llm(map_reduce=False, max_retries=MAX_CHUNK_RETRIES):
     print("📥 Loading final_comments.csv")
 
     df = pd.read_csv("final_comments.csv")
@@ -59,9 +63,21 @@ def extract_keywords_llm():
     )
     print(f"✅ Loaded {len(comments)} comments")
 
+    if map_reduce:
+        # Chunked extraction already dedupes and ranks in its reduce step
+        with open("prompts/keyword_prompt.txt", "r", encoding="utf-8") as file:
+            template = file.read()
+        model = get_embedding_model(EMBEDDING_MODEL_NAME)
+        encode = cached_encoder(model, EMBEDDING_MODEL_NAME)
+        deduped_keywords = extract_keywords_map_reduce(comments, template, encode, top_k=20)
+        print(f"✅ Final keywords ({len(deduped_keywords)}): {deduped_keywords}")
+        return comments, deduped_keywords
+
     keywords = extract_keywords_llm_helper(comments)
 
-    while len(keywords) < 15:
+    for _ in range(max_retries):
+        if len(keywords) >= 15:
+            break
         keywords = extract_keywords_llm_helper(comments)
 
     print("🧹 Deduplicating semantically similar phrases...")
@@ -76,19 +92,28 @@ def extract_keywords_llm():
 # ------------------------
 
 def deduplicate_phrases(phrases, threshold=0.85):
-    model = SentenceTransformer(EMBEDDING_MODEL_NAME)
-    embeddings = model.encode(phrases)
-    sim_matrix = cosine_similarity(embeddings)
+    if not phrases:
+        return []
+    model = get_embedding_model(EMBEDDING_MODEL_NAME)
+    embeddings = cached_encoder(model, EMBEDDING_MODEL_NAME)(phrases)
+    mapping = cluster_phrases(phrases, embeddings, threshold)
+    return canonical_phrases(mapping, phrases)
 
-    keep = []
-    seen = set()
-    for i, phrase in enumerate(phrases):
-        if i in seen:
-            continue
-        group = [j for j in range(len(phrases)) if sim_matrix[i][j] >= threshold]
-        seen.update(group)
-        keep.append(phrase)
-    return keep
+
+def dedupe_keyword_table(threshold=0.85):
+    """Cluster every keyword in the DB and merge near-duplicates into their canonical row."""
+    usage = get_keyword_usage_counts()
+    texts = list(usage)
+    if not texts:
+        return {}
+
+    model = get_embedding_model(EMBEDDING_MODEL_NAME)
+    embeddings = cached_encoder(model, EMBEDDING_MODEL_NAME)([normalize(t) for t in texts])
+    mapping = cluster_phrases(texts, embeddings, threshold, weights=[usage[t] for t in texts])
+
+    merged = merge_keywords(mapping)
+    print(f"🧹 Merged {merged} duplicate keywords into {len(set(mapping.values()))} canonical ones")
+    return mapping
 
 
 # ------------------------
@@ -100,34 +125,38 @@ def normalize(text):
     return re.sub(r"[^\w\s]", "", text.lower().strip())
 
 
-def embed_and_match(df, keywords, model_name=EMBEDDING_MODEL_NAME, threshold=0.5):
-    """Embed comments and keywords, compute cosine similarity, and return matches."""
+def embed_and_match(df, keywords, model_name=EMBEDDING_MODEL_NAME, threshold=0.5,
+                    chunk_size=MATCH_CHUNK_SIZE):
+    """
+    Embed comments and keywords and return matches. Adds `keywords` (sorted
+    matched keywords) and `keyword_scores` ({keyword: cosine similarity}).
+    """
     comments = df["text"].astype(str).tolist()
     norm_comments = [normalize(c) for c in comments]
     norm_keywords = [normalize(k) for k in keywords]
 
-    model = SentenceTransformer(model_name)
-    comment_embeddings = model.encode(norm_comments, convert_to_tensor=True).cpu().numpy()
-    keyword_embeddings = model.encode(norm_keywords, convert_to_tensor=True).cpu().numpy()
-
-    sim_matrix = cosine_similarity(comment_embeddings, keyword_embeddings)
+    model = get_embedding_model(model_name)
+    encode = cached_encoder(model, model_name)
+    keyword_embeddings = encode(norm_keywords)
 
     all_keywords = []
-    for i, comment in enumerate(comments):
-        matched_keywords = []
-        for j, keyword in enumerate(keywords):
-            if sim_matrix[i][j] >= threshold:
-                matched_keywords.append(keyword)
-        all_keywords.append(sorted(matched_keywords))
+    all_scores = []
+    for matches in iter_matches(encode, norm_comments, keyword_embeddings, threshold, chunk_size):
+        scores = {keywords[j]: round(score, 4) for j, score in matches}
+        all_keywords.append(sorted(scores))
+        all_scores.append(scores)
 
     df["keywords"] = all_keywords
+    df["keyword_scores"] = all_scores
     return df
 
 
-def run_embedding_pipeline(keywords):
+def run_embedding_pipeline(keywords, incremental=False, video_url="http://example.com"):
     print("📥 Loading final_comments.csv and keywords.csv...")
 
-    df_comments = pd.read_csv("final_comments.csv")
+    # Keep ids as strings; numeric-looking cids would otherwise lose precision
+    df_comments = pd.read_csv("final_comments.csv", dtype={"source_id": str, "content_hash": str})
+    df_comments = df_comments.astype(object).where(df_comments.notna(), None)
 
     print(f"✅ Loaded {len(df_comments)} comments and {len(keywords)} keywords.")
     print("🔍 Running embedding similarity...")
@@ -135,12 +164,16 @@ def run_embedding_pipeline(keywords):
 
     print("💾 Saving results to comment_keyword_map.json...")
 
-    json_records = result_df[["text", "sentiment", "keywords"]].to_dict(orient="records")
+    columns = ["text", "sentiment", "keywords", "keyword_scores", "source_id", "content_hash"]
+    json_records = result_df.reindex(columns=columns).to_dict(orient="records")
     lowercased_records = [
         {
+            "source_id": record["source_id"],
+            "content_hash": record["content_hash"],
             "text": record["text"].lower(),
             "sentiment": (record["sentiment"] or "").lower(),
-            "keywords": [kw.lower() for kw in record["keywords"]]
+            "keywords": [kw.lower() for kw in record["keywords"]],
+            "keyword_scores": {kw.lower(): score for kw, score in record["keyword_scores"].items()},
         }
         for record in json_records
     ]
@@ -148,7 +181,9 @@ def run_embedding_pipeline(keywords):
         json.dump(lowercased_records, f, indent=2, ensure_ascii=False)
 
     print("📤 Loading records into the database...")
-    load_comments_to_db("comment_keyword_map.json")
+    ledger = ProcessedLedger() if incremental else None
+    load_comments_to_db_bulk("comment_keyword_map.json", video_url=video_url,
+                             incremental=incremental, ledger=ledger)
 
     print("✅ Done.")
 
@@ -160,7 +195,6 @@ def run_embedding_pipeline(keywords):
 def build_graph():
     print("🔍 Building graph directly from DB...")
     graph = build_graph_from_db()
-    graph = add_llm_links(graph)   # optional enrichment
     save_graph_to_json(graph)
 
     print("📤 Loading graph into the database...")
@@ -172,6 +206,12 @@ def build_graph():
 # ------------------------
 
 if __name__ == "__main__":
-    comments, keywords = extract_keywords_llm()
-    run_embedding_pipeline(keywords)
+    # python theme_and_graph.py --incremental  -> match only the new comments
+    # written by `scraping.py --incremental` against the video's existing keywords
+    incremental = "--incremental" in sys.argv
+    keywords = get_video_keyword_texts("http://example.com") if incremental else []
+    if not keywords:
+        # --map-reduce: chunked extraction for videos with many comments
+        comments, keywords = extract_keywords_llm(map_reduce="--map-reduce" in sys.argv)
+    run_embedding_pipeline(keywords, incremental=incremental)
     build_graph()
\ No newline at end of file
@@ -0,0 +1,106 @@
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import argostranslate.package
+import argostranslate.translate
+
+
+class TranslationRegistry:
+    """
+    Resolves Argos `Translation` objects once per language pair and keeps them
+    for the life of the process, instead of enumerating installed languages
+    (and possibly the package index) for every comment.
+    """
+
+    def __init__(self, auto_install=True):
+        self.auto_install = auto_install
+        self._translations: Dict[Tuple[str, str], Optional[object]] = {}
+        self._installed = None
+        self._available = None
+
+    def _installed_languages(self):
+        if self._installed is None:
+            self._installed = {lang.code: lang for lang in argostranslate.translate.get_installed_languages()}
+        return self._installed
+
+    def _install(self, source_lang, target_lang) -> bool:
+        if self._available is None:
+            self._available = argostranslate.package.get_available_packages()
+
+        for pkg in self._available:
+            if pkg.from_code == source_lang and pkg.to_code == target_lang:
+                argostranslate.package.install_from_path(pkg.download())
+                self._installed = None  # re-read on next lookup
+                print(f"✅ Installed translation model: {source_lang} → {target_lang}")
+                return True
+        return False
+
+    def get(self, source_lang, target_lang="en"):
+        """Cached Translation for the pair, or None if no model is available."""
+        key = (source_lang, target_lang)
+        if key in self._translations:
+            return self._translations[key]
+
+        translation = self._lookup(source_lang, target_lang)
+        if translation is None and self.auto_install and self._install(source_lang, target_lang):
+            translation = self._lookup(source_lang, target_lang)
+        if translation is None:
+            print(f"⚠️ No translation model available for: {source_lang} → {target_lang}")
+
+        self._translations[key] = translation
+        return translation
+
+    def _lookup(self, source_lang, target_lang):
+        installed = self._installed_languages()
+        from_lang, to_lang = installed.get(source_lang), installed.get(target_lang)
+        if from_lang is None or to_lang is None:
+            return None
+        return from_lang.get_translation(to_lang)
+
+
+_registry: Optional[TranslationRegistry] = None
+
+
+def get_translation_registry() -> TranslationRegistry:
+    global _registry
+    if _registry is None:
+        _registry = TranslationRegistry()
+    return _registry
+
+
+def translate_group(translation, texts: List[str]) -> List[str]:
+    """Translate same-language texts one at a time through one cached Translation."""
+    results = []
+    for text in texts:
+        try:
+            results.append(translation.translate(text))
+        except Exception as e:
+            print(f"⚠️ Translation failed for: {text} ({e}); keeping original text")
+            results.append(text)
+    return results
+
+
+def translate_texts(texts: List[str], langs: List[str], target_lang="en",
+                    registry: TranslationRegistry = None) -> List[str]:
+    """
+    Translate texts whose detected language (e.g. the `lang` column from
+    language_id) differs from `target_lang`, grouped by source language.
+    Texts with no available model are returned unchanged.
+    """
+    registry = registry or get_translation_registry()
+    results = list(texts)
+
+    groups = defaultdict(list)
+    for i, (text, lang) in enumerate(zip(texts, langs)):
+        if isinstance(text, str) and text.strip() and lang and lang != target_lang:
+            groups[lang].append(i)
+
+    for lang, indices in groups.items():
+        translation = registry.get(lang, target_lang)
+        if translation is None:
+            continue
+        translated = translate_group(translation, [texts[i] for i in indices])
+        for i, text in zip(indices, translated):
+            results[i] = text
+
+    return results
@@ -0,0 +1,46 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+
+from app.schemas.brand import BrandOut
+from app.schemas.keyword import KeywordOut
+from app.schemas.comment import CommentWithKeywordsOut
+from app.crud import async_crud
+from app.crud.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.api.deps import get_async_db
+
+# Async versions of the read-heavy v1 routes. When DB_ASYNC is set they
+# replace the sync routes for the same paths (see replace_routes in main.py).
+router = APIRouter()
+
+@router.get("/brands/", response_model=List[BrandOut], tags=["brands"])
+async def read_brands(
+    after_id: int | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await async_crud.get_brands(db, after_id=after_id, limit=limit)
+
+@router.get("/brands/{brand_id}", response_model=BrandOut, tags=["brands"])
+async def read_brand(brand_id: int, db: AsyncSession = Depends(get_async_db)):
+    brand = await async_crud.get_brand(db, brand_id)
+    if not brand:
+        raise HTTPException(status_code=404, detail="Brand not found")
+    return brand
+
+@router.get("/keywords/", response_model=List[KeywordOut], tags=["keywords"])
+async def get_keywords(
+    after_id: int | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await async_crud.get_all_keywords(db, after_id=after_id, limit=limit)
+
+@router.get("/comments/video/{video_id}", response_model=List[CommentWithKeywordsOut], tags=["comments"])
+async def get_comments_by_video(
+    video_id: int,
+    after_id: int | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await async_crud.get_comments_by_video(db, video_id, after_id, limit)
@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import List
 
 from app.schemas.brand import BrandCreate, BrandOut
 from app.crud import brand as crud_brand
+from app.crud.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from app.api.deps import get_db
 
 router = APIRouter(prefix="/brands", tags=["brands"])
@@ -13,8 +14,12 @@ def create_brand(brand: BrandCreate, db: Session = Depends(get_db)):
     return crud_brand.create_brand(db, brand)
 
 @router.get("/", response_model=List[BrandOut])
-def read_brands(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return crud_brand.get_brands(db, skip=skip, limit=limit)
+def read_brands(
+    after_id: int | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_db),
+):
+    return crud_brand.get_brands(db, after_id=after_id, limit=limit)
 
 @router.get("/{brand_id}", response_model=BrandOut)
 def read_brand(brand_id: int, db: Session = Depends(get_db)):
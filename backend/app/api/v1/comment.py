@@ -1,17 +1,70 @@
-from fastapi import APIRouter, Depends
+import json
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from typing import List
 
-from app.schemas.comment import CommentCreate, CommentOut
+from app.schemas.comment import CommentCreate, CommentOut, CommentWithKeywordsOut, CommentBulkCreate, CommentBulkOut
 from app.crud import comment as crud_comment
+from app.crud import brand as crud_brand
+from app.crud import video as crud_video
+from app.crud.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.crud import graph as crud_graph
+from app.core.cache import graph_cache
 from app.api.deps import get_db
+from app.db.session import SessionLocal
 
 router = APIRouter(prefix="/comments", tags=["comments"])
 
 @router.post("/", response_model=CommentOut)
 def create_comment(comment: CommentCreate, db: Session = Depends(get_db)):
-    return crud_comment.create_comment(db, comment, keywords=comment.keywords)
+    db_comment = crud_comment.create_comment(db, comment, keywords=comment.keywords)
+    graph_cache.invalidate(crud_graph.get_brand_id_for_video(db, comment.video_id))
+    return db_comment
 
-@router.get("/video/{video_id}", response_model=List[CommentOut])
-def get_comments_by_video(video_id: int, db: Session = Depends(get_db)):
-    return crud_comment.get_comments_by_video(db, video_id)
+@router.post("/bulk", response_model=CommentBulkOut)
+def create_comments_bulk(bulk: CommentBulkCreate, db: Session = Depends(get_db)):
+    try:
+        ids = crud_comment.create_comments_bulk(db, bulk)
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Unknown video_id or keyword_id")
+    graph_cache.invalidate(crud_graph.get_brand_id_for_video(db, bulk.video_id))
+    return {"video_id": bulk.video_id, "ids": ids}
+
+@router.get("/video/{video_id}", response_model=List[CommentWithKeywordsOut])
+def get_comments_by_video(
+    video_id: int,
+    after_id: int | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_db),
+):
+    return crud_comment.get_comments_by_video(db, video_id, after_id, limit)
+
+def stream_comment_export(**filters):
+    # The request's session is closed before the body is streamed, so use our own
+    db = SessionLocal()
+    try:
+        lines = []
+        for row in crud_comment.iter_comment_export(db, **filters):
+            lines.append(json.dumps(row, ensure_ascii=False) + "\n")
+            if len(lines) >= crud_comment.EXPORT_BATCH_SIZE:
+                yield "".join(lines)
+                lines = []
+        if lines:
+            yield "".join(lines)
+    finally:
+        db.close()
+
+@router.get("/video/{video_id}/export")
+def export_comments_by_video(video_id: int, db: Session = Depends(get_db)):
+    if not crud_video.get_video(db, video_id):
+        raise HTTPException(status_code=404, detail="Video not found")
+    return StreamingResponse(stream_comment_export(video_id=video_id), media_type="application/x-ndjson")
+
+@router.get("/brand/{brand_id}/export")
+def export_comments_by_brand(brand_id: int, db: Session = Depends(get_db)):
+    if not crud_brand.get_brand(db, brand_id):
+        raise HTTPException(status_code=404, detail="Brand not found")
+    return StreamingResponse(stream_comment_export(brand_id=brand_id), media_type="application/x-ndjson")
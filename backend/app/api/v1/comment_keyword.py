@@ -1,24 +1,44 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from typing import List
 
 from app.schemas.comment_keyword import CommentKeywordCreate, CommentKeywordOut
 from app.crud import comment_keyword as crud_ck
+from app.crud.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.crud import graph as crud_graph
+from app.core.cache import graph_cache
 from app.api.deps import get_db
 
 router = APIRouter(prefix="/comment-keywords", tags=["comment_keywords"])
 
 @router.post("/", response_model=CommentKeywordOut)
 def create_comment_keyword(mapping: CommentKeywordCreate, db: Session = Depends(get_db)):
-    return crud_ck.create_comment_keyword(db, mapping)
+    try:
+        created = crud_ck.create_comment_keyword(db, mapping)
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Mapping already exists, or unknown comment_id or keyword_id")
+    graph_cache.invalidate(crud_graph.get_brand_id_for_comment(db, mapping.comment_id))
+    return created
 
 @router.get("/comment/{comment_id}", response_model=List[CommentKeywordOut])
-def get_keywords_for_comment(comment_id: int, db: Session = Depends(get_db)):
-    return crud_ck.get_keywords_for_comment(db, comment_id)
+def get_keywords_for_comment(
+    comment_id: int,
+    after_id: int | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_db),
+):
+    return crud_ck.get_keywords_for_comment(db, comment_id, after_id, limit)
 
 @router.get("/keyword/{keyword_id}", response_model=List[CommentKeywordOut])
-def get_comments_for_keyword(keyword_id: int, db: Session = Depends(get_db)):
-    return crud_ck.get_comments_for_keyword(db, keyword_id)
+def get_comments_for_keyword(
+    keyword_id: int,
+    after_id: int | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_db),
+):
+    return crud_ck.get_comments_for_keyword(db, keyword_id, after_id, limit)
 
 @router.put("/{mapping_id}", response_model=CommentKeywordOut)
 def update_mapping_weight(mapping_id: int, weight: float, db: Session = Depends(get_db)):
@@ -32,4 +52,5 @@ def delete_mapping(mapping_id: int, db: Session = Depends(get_db)):
     deleted = crud_ck.delete_comment_keyword(db, mapping_id)
     if not deleted:
         raise HTTPException(status_code=404, detail="Mapping not found")
+    graph_cache.invalidate(crud_graph.get_brand_id_for_comment(db, deleted.comment_id))
     return deleted
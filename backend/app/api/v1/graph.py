@@ -0,0 +1,44 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.orm import Session
+
+from app.schemas.graph import GraphOut
+from app.crud import brand as crud_brand
+from app.crud import graph as crud_graph
+from app.core.cache import graph_cache
+from app.api.deps import get_db
+
+router = APIRouter(prefix="/brands", tags=["graph"])
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+@router.get("/{brand_id}/graph", response_model=GraphOut)
+def read_brand_graph(
+    brand_id: int,
+    request: Request,
+    response: Response,
+    min_weight: int = Query(1, ge=1, description="Drop keywords mentioned in fewer comments"),
+    min_link_value: int = Query(1, ge=1, description="Drop links shared by fewer comments"),
+    max_nodes: int | None = Query(None, ge=1, description="Keep only the heaviest keywords"),
+    top_k_links_per_node: int | None = Query(None, ge=1, description="Keep each keyword's strongest links"),
+    db: Session = Depends(get_db),
+):
+    filters = (min_weight, min_link_value, max_nodes, top_k_links_per_node)
+    key = (brand_id, *filters)
+    entry = graph_cache.get(key)
+    if entry is None:
+        if not crud_brand.get_brand(db, brand_id):
+            raise HTTPException(status_code=404, detail="Brand not found")
+        graph = crud_graph.get_graph_from_stats(db, brand_id, *filters)
+        entry = graph_cache.set(key, graph)
+
+    # no-cache: browsers keep the body but revalidate with If-None-Match every time
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return entry.value
@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 from typing import List
 
 from app.schemas.keyword import KeywordCreate, KeywordOut
 from app.crud import keyword as crud_keyword
+from app.crud.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from app.api.deps import get_db
 
 router = APIRouter(prefix="/keywords", tags=["keywords"])
@@ -13,5 +14,9 @@ def create_keyword(keyword: KeywordCreate, db: Session = Depends(get_db)):
     return crud_keyword.create_keyword(db, keyword)
 
 @router.get("/", response_model=List[KeywordOut])
-def get_keywords(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return crud_keyword.get_all_keywords(db, skip=skip, limit=limit)
+def get_keywords(
+    after_id: int | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_db),
+):
+    return crud_keyword.get_all_keywords(db, after_id=after_id, limit=limit)
@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 from typing import List
 
 from app.schemas.product import ProductCreate, ProductOut
 from app.crud import product as crud_product
+from app.crud.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from app.api.deps import get_db
 
 router = APIRouter(prefix="/products", tags=["products"])
@@ -13,5 +14,10 @@ def create_product(product: ProductCreate, db: Session = Depends(get_db)):
     return crud_product.create_product(db, product)
 
 @router.get("/brand/{brand_id}", response_model=List[ProductOut])
-def get_products_by_brand(brand_id: int, db: Session = Depends(get_db)):
-    return crud_product.get_products_by_brand(db, brand_id)
+def get_products_by_brand(
+    brand_id: int,
+    after_id: int | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_db),
+):
+    return crud_product.get_products_by_brand(db, brand_id, after_id, limit)
@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 from typing import List
 
 from app.schemas.user import UserCreate, UserOut
 from app.crud import user as crud_user
+from app.crud.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from app.api.deps import get_db
 
 router = APIRouter(prefix="/users", tags=["users"])
@@ -13,5 +14,10 @@ def create_user(user: UserCreate, db: Session = Depends(get_db)):
     return crud_user.create_user(db, user)
 
 @router.get("/brand/{brand_id}", response_model=List[UserOut])
-def get_users_by_brand(brand_id: int, db: Session = Depends(get_db)):
-    return crud_user.get_users_by_brand(db, brand_id)
+def get_users_by_brand(
+    brand_id: int,
+    after_id: int | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_db),
+):
+    return crud_user.get_users_by_brand(db, brand_id, after_id, limit)
@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 from typing import List
 
 from app.schemas.video import VideoCreate, VideoOut
 from app.crud import video as crud_video
+from app.crud.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from app.api.deps import get_db
 
 router = APIRouter(prefix="/videos", tags=["videos"])
@@ -13,5 +14,10 @@ def create_video(video: VideoCreate, db: Session = Depends(get_db)):
     return crud_video.create_video(db, video)
 
 @router.get("/product/{product_id}", response_model=List[VideoOut])
-def get_videos_by_product(product_id: int, db: Session = Depends(get_db)):
-    return crud_video.get_videos_by_product(db, product_id)
+def get_videos_by_product(
+    product_id: int,
+    after_id: int | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_db),
+):
+    return crud_video.get_videos_by_product(db, product_id, after_id, limit)
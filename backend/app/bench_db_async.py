@@ -0,0 +1,102 @@
+"""
+Load test: sync (threadpool + psycopg2) vs async (AsyncSession + asyncpg) v1 routes.
+
+Starts `uvicorn app.api.main:app` once per mode with DB_ASYNC set accordingly,
+hammers one read endpoint with `--concurrency` keep-alive clients and reports
+requests/sec and latency percentiles. Point DATABASE_URL at a local PostgreSQL
+that already has data (e.g. after running app/test_db.py or the pipeline).
+
+    python -m app.bench_db_async --path "/comments/video/1?limit=100" --concurrency 64
+"""
+import os
+import sys
+import time
+import argparse
+import subprocess
+import http.client
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+
+
+def wait_for_server(port, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/openapi.json")
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Server on port {port} did not start")
+
+
+def run_client(port, path, n_requests):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    latencies, errors = [], 0
+    for _ in range(n_requests):
+        start = time.perf_counter()
+        try:
+            conn.request("GET", path)
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                errors += 1
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            conn.close()
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        latencies.append(time.perf_counter() - start)
+    conn.close()
+    return latencies, errors
+
+
+def load_test(port, path, total_requests, concurrency):
+    per_client = max(1, total_requests // concurrency)
+    run_client(port, path, 20)  # warm up pools and caches
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda _: run_client(port, path, per_client), range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(lat for lats, _ in results for lat in lats)
+    errors = sum(err for _, err in results)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+def bench_mode(mode, args):
+    env = dict(os.environ, DB_ASYNC="true" if mode == "async" else "false")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.api.main:app",
+         "--port", str(args.port), "--log-level", "warning"],
+        env=env,
+    )
+    try:
+        wait_for_server(args.port)
+        return load_test(args.port, args.path, args.requests, args.concurrency)
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--path", default="/comments/video/1?limit=100")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--port", type=int, default=8011)
+    parser.add_argument("--modes", nargs="+", default=["sync", "async"], choices=["sync", "async"])
+    args = parser.parse_args()
+
+    print(f"🔁 GET {args.path}: {args.requests} requests, {args.concurrency} concurrent clients")
+    for mode in args.modes:
+        r = bench_mode(mode, args)
+        print(f"{mode:>5}: {r['rps']:8.1f} req/s  p50 {r['p50_ms']:7.1f} ms  "
+              f"p99 {r['p99_ms']:7.1f} ms  errors {r['errors']}/{r['requests']}")
@@ -0,0 +1,213 @@
+"""
+EXPLAIN ANALYZE timings of the graph and listing queries without/with the
+join-path indexes from migration 89a858603b0d and the denormalized brand
+scope indexes from 706e9ee6f51a.
+
+Everything runs in one transaction that is rolled back at the end: a synthetic
+multi-brand dataset is seeded, the indexes (and the (comment_id, keyword_id)
+unique constraint) are dropped for the "before" run and recreated for the
+"after" run. The database must be at alembic head.
+
+    python -m app.bench_indexes --brands 20 --comments-per-video 100
+"""
+import json
+import argparse
+import statistics
+from sqlalchemy import text
+
+from app.db.session import engine
+
+INDEXES = {
+    "ix_comments_video_id": "CREATE INDEX ix_comments_video_id ON comments (video_id)",
+    "ix_comment_keywords_keyword_id": "CREATE INDEX ix_comment_keywords_keyword_id ON comment_keywords (keyword_id)",
+    "ix_videos_product_id": "CREATE INDEX ix_videos_product_id ON videos (product_id)",
+    "ix_products_brand_id": "CREATE INDEX ix_products_brand_id ON products (brand_id)",
+    "ix_comments_brand_id": "CREATE INDEX ix_comments_brand_id ON comments (brand_id)",
+    "ix_comment_keywords_brand_id_keyword_id":
+        "CREATE INDEX ix_comment_keywords_brand_id_keyword_id ON comment_keywords (brand_id, keyword_id)",
+}
+UNIQUE_CONSTRAINT = (
+    "ALTER TABLE comment_keywords ADD CONSTRAINT uq_comment_keywords_comment_id_keyword_id "
+    "UNIQUE (comment_id, keyword_id)"
+)
+
+# The queries behind build_graph_from_db / query_cooccurrence_links (the
+# "join" variants are the pre-706e9ee6f51a forms that walk videos/products)
+# and the v1 get_*_by_* listings (selectinload's follow-up query included)
+QUERIES = {
+    "graph: keyword stats (join)": """
+        SELECT k.text, count(ck.id),
+               sum(CASE WHEN c.sentiment = 'positive' THEN 1 ELSE 0 END),
+               sum(CASE WHEN c.sentiment = 'negative' THEN 1 ELSE 0 END),
+               sum(CASE WHEN c.sentiment = 'neutral' THEN 1 ELSE 0 END)
+        FROM keywords k
+        JOIN comment_keywords ck ON ck.keyword_id = k.id
+        JOIN comments c ON c.id = ck.comment_id
+        JOIN videos v ON v.id = c.video_id
+        JOIN products p ON p.id = v.product_id
+        JOIN brands b ON b.id = p.brand_id
+        WHERE b.id = :brand_id
+        GROUP BY k.text
+    """,
+    "graph: keyword stats": """
+        SELECT k.text, count(ck.id),
+               sum(CASE WHEN c.sentiment = 'positive' THEN 1 ELSE 0 END),
+               sum(CASE WHEN c.sentiment = 'negative' THEN 1 ELSE 0 END),
+               sum(CASE WHEN c.sentiment = 'neutral' THEN 1 ELSE 0 END)
+        FROM keywords k
+        JOIN comment_keywords ck ON ck.keyword_id = k.id
+        JOIN comments c ON c.id = ck.comment_id
+        WHERE ck.brand_id = :brand_id AND c.brand_id = :brand_id
+        GROUP BY k.text
+    """,
+    "graph: co-occurrence (join)": """
+        WITH comment_kw AS (
+            SELECT DISTINCT ck.comment_id, lower(k.text) AS keyword
+            FROM comment_keywords ck
+            JOIN keywords k ON k.id = ck.keyword_id
+            JOIN comments c ON c.id = ck.comment_id
+            JOIN videos v ON v.id = c.video_id
+            JOIN products p ON p.id = v.product_id
+            WHERE p.brand_id = :brand_id
+        )
+        SELECT a.keyword, b.keyword, count(*)
+        FROM comment_kw a
+        JOIN comment_kw b ON b.comment_id = a.comment_id AND a.keyword < b.keyword
+        GROUP BY a.keyword, b.keyword
+    """,
+    "graph: co-occurrence": """
+        WITH comment_kw AS (
+            SELECT DISTINCT ck.comment_id, lower(k.text) AS keyword
+            FROM comment_keywords ck
+            JOIN keywords k ON k.id = ck.keyword_id
+            WHERE ck.brand_id = :brand_id
+        )
+        SELECT a.keyword, b.keyword, count(*)
+        FROM comment_kw a
+        JOIN comment_kw b ON b.comment_id = a.comment_id AND a.keyword < b.keyword
+        GROUP BY a.keyword, b.keyword
+    """,
+    "list: comments by brand": "SELECT * FROM comments WHERE brand_id = :brand_id ORDER BY id LIMIT 100",
+    "list: products by brand": "SELECT * FROM products WHERE brand_id = :brand_id ORDER BY id LIMIT 100",
+    "list: videos by product": "SELECT * FROM videos WHERE product_id = :product_id ORDER BY id LIMIT 100",
+    "list: comments by video": "SELECT * FROM comments WHERE video_id = :video_id ORDER BY id LIMIT 100",
+    "list: keywords for comments": """
+        SELECT * FROM comment_keywords
+        WHERE comment_id IN (SELECT id FROM comments WHERE video_id = :video_id ORDER BY id LIMIT 100)
+    """,
+    "list: comments for keyword": "SELECT * FROM comment_keywords WHERE keyword_id = :keyword_id ORDER BY id LIMIT 100",
+}
+
+
+def seed(conn, brands, products_per_brand, videos_per_product, comments_per_video, keywords, keywords_per_comment):
+    # Row triggers keeping the brand graph tables current would dominate seeding time
+    conn.execute(text("ALTER TABLE comment_keywords DISABLE TRIGGER comment_keywords_brand_graph"))
+
+    conn.execute(text("""
+        INSERT INTO brands (name) SELECT 'bench brand ' || g FROM generate_series(1, :n) g
+    """), {"n": brands})
+    conn.execute(text("""
+        INSERT INTO products (name, brand_id)
+        SELECT 'bench product ' || g, b.id
+        FROM brands b, generate_series(1, :n) g
+        WHERE b.name LIKE 'bench brand %'
+    """), {"n": products_per_brand})
+    conn.execute(text("""
+        INSERT INTO videos (platform, url, product_id)
+        SELECT 'TikTok', 'http://bench.example/' || p.id || '/' || g, p.id
+        FROM products p, generate_series(1, :n) g
+        WHERE p.name LIKE 'bench product %'
+    """), {"n": videos_per_product})
+    conn.execute(text("""
+        INSERT INTO comments (text, sentiment, video_id)
+        SELECT 'bench comment ' || g,
+               (ARRAY['positive', 'negative', 'neutral'])[1 + (g + v.id) % 3],
+               v.id
+        FROM videos v, generate_series(1, :n) g
+        WHERE v.url LIKE 'http://bench.example/%'
+    """), {"n": comments_per_video})
+    conn.execute(text("""
+        INSERT INTO keywords (text) SELECT 'bench keyword ' || g FROM generate_series(1, :n) g
+    """), {"n": keywords})
+    conn.execute(text("""
+        INSERT INTO comment_keywords (comment_id, keyword_id, weight)
+        SELECT DISTINCT c.id, k.id, 1.0
+        FROM comments c
+        CROSS JOIN generate_series(1, :per_comment) g
+        JOIN keywords k ON k.text = 'bench keyword ' || (1 + (c.id::bigint * 7919 + g * 104729) % :keywords)
+        WHERE c.text LIKE 'bench comment %'
+    """), {"per_comment": keywords_per_comment, "keywords": keywords})
+    conn.execute(text("ANALYZE"))
+
+
+def sample_params(conn):
+    return dict(conn.execute(text("""
+        SELECT
+            (SELECT min(id) FROM brands WHERE name LIKE 'bench brand %') AS brand_id,
+            (SELECT min(id) FROM products WHERE name LIKE 'bench product %') AS product_id,
+            (SELECT min(id) FROM videos WHERE url LIKE 'http://bench.example/%') AS video_id,
+            (SELECT min(id) FROM keywords WHERE text LIKE 'bench keyword %') AS keyword_id
+    """)).mappings().one())
+
+
+def explain_ms(conn, sql, params, repeat):
+    timings = []
+    for _ in range(repeat):
+        plan = conn.execute(text("EXPLAIN (ANALYZE, FORMAT JSON) " + sql), params).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        timings.append(plan[0]["Execution Time"])
+    return statistics.median(timings)
+
+
+def run_queries(conn, params, repeat):
+    return {name: explain_ms(conn, sql, params, repeat) for name, sql in QUERIES.items()}
+
+
+def drop_indexes(conn):
+    conn.execute(text("ALTER TABLE comment_keywords DROP CONSTRAINT IF EXISTS uq_comment_keywords_comment_id_keyword_id"))
+    for name in INDEXES:
+        conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+    conn.execute(text("ANALYZE"))
+
+
+def create_indexes(conn):
+    conn.execute(text(UNIQUE_CONSTRAINT))
+    for ddl in INDEXES.values():
+        conn.execute(text(ddl))
+    conn.execute(text("ANALYZE"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--brands", type=int, default=20)
+    parser.add_argument("--products-per-brand", type=int, default=5)
+    parser.add_argument("--videos-per-product", type=int, default=10)
+    parser.add_argument("--comments-per-video", type=int, default=100)
+    parser.add_argument("--keywords", type=int, default=500)
+    parser.add_argument("--keywords-per-comment", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=5, help="EXPLAIN ANALYZE runs per query (median reported)")
+    args = parser.parse_args()
+
+    n_comments = args.brands * args.products_per_brand * args.videos_per_product * args.comments_per_video
+    print(f"🌱 Seeding {args.brands} brands, {n_comments} comments, {args.keywords} keywords...")
+
+    with engine.connect() as conn:
+        trans = conn.begin()
+        try:
+            seed(conn, args.brands, args.products_per_brand, args.videos_per_product,
+                 args.comments_per_video, args.keywords, args.keywords_per_comment)
+            params = sample_params(conn)
+
+            drop_indexes(conn)
+            before = run_queries(conn, params, args.repeat)
+            create_indexes(conn)
+            after = run_queries(conn, params, args.repeat)
+        finally:
+            # Leave the database as it was
+            trans.rollback()
+
+    print(f"{'query':<34} {'before ms':>10} {'after ms':>10} {'speedup':>8}")
+    for name in QUERIES:
+        speedup = before[name] / after[name] if after[name] else float("inf")
+        print(f"{name:<34} {before[name]:>10.2f} {after[name]:>10.2f} {speedup:>7.1f}x")
@@ -0,0 +1,55 @@
+import json
+import time
+import hashlib
+from threading import Lock
+from typing import Any, Hashable, NamedTuple
+
+from app.core.config import settings
+
+class CacheEntry(NamedTuple):
+    value: Any
+    etag: str
+    expires_at: float
+
+def make_etag(value: Any) -> str:
+    payload = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return '"' + hashlib.sha1(payload.encode("utf-8")).hexdigest() + '"'
+
+class TTLCache:
+    """
+    In-process cache with a per-entry TTL. Keys are tuples whose first item
+    is the scope (e.g. a brand id), so writes can drop every entry for a scope.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._entries: dict[tuple, CacheEntry] = {}
+        self._lock = Lock()
+
+    def get(self, key: tuple) -> CacheEntry | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            return entry
+
+    def set(self, key: tuple, value: Any) -> CacheEntry:
+        entry = CacheEntry(value, make_etag(value), time.monotonic() + self.ttl_seconds)
+        with self._lock:
+            self._entries[key] = entry
+        return entry
+
+    def invalidate(self, scope: Hashable):
+        """Drop every entry whose key starts with `scope`."""
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == scope]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+graph_cache = TTLCache(settings.GRAPH_CACHE_TTL_SECONDS)
@@ -0,0 +1,50 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from app.models.brand import Brand
+from app.models.comment import Comment
+from app.models.comment_keyword import CommentKeyword
+from app.models.keyword import Keyword
+from app.models.product import Product
+from app.models.video import Video
+from app.crud.pagination import DEFAULT_PAGE_SIZE, keyset_select
+
+# Async variants of the read paths in app/crud, for DB_ASYNC=true. AsyncSession
+# cannot lazy-load, so every relationship a response model touches is eager-loaded.
+
+# BrandOut nests products -> videos -> comments -> keyword mappings
+BRAND_OUT_LOAD = (
+    selectinload(Brand.products)
+    .selectinload(Product.videos)
+    .selectinload(Video.comments)
+    .selectinload(Comment.keywords),
+    selectinload(Brand.users),
+)
+
+async def get_brands(db: AsyncSession, after_id: int | None = None, limit: int = DEFAULT_PAGE_SIZE):
+    stmt = select(Brand).options(*BRAND_OUT_LOAD)
+    result = await db.scalars(keyset_select(stmt, Brand.id, after_id, limit))
+    return result.all()
+
+async def get_brand(db: AsyncSession, brand_id: int):
+    stmt = (
+        select(Brand)
+        .options(*BRAND_OUT_LOAD)
+        .where(Brand.id == brand_id)
+    )
+    return await db.scalar(stmt)
+
+async def get_all_keywords(db: AsyncSession, after_id: int | None = None, limit: int = DEFAULT_PAGE_SIZE):
+    stmt = select(Keyword).options(selectinload(Keyword.comment_keywords))
+    result = await db.scalars(keyset_select(stmt, Keyword.id, after_id, limit))
+    return result.all()
+
+async def get_comments_by_video(db: AsyncSession, video_id: int, after_id: int | None = None,
+                                limit: int = DEFAULT_PAGE_SIZE):
+    stmt = (
+        select(Comment)
+        .options(selectinload(Comment.keywords).selectinload(CommentKeyword.keyword))
+        .where(Comment.video_id == video_id)
+    )
+    result = await db.scalars(keyset_select(stmt, Comment.id, after_id, limit))
+    return result.all()
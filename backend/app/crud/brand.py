@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
 from app.models.brand import Brand
 from app.schemas.brand import BrandCreate
+from app.crud.pagination import DEFAULT_PAGE_SIZE, keyset_page
 
 # CREATE
 def create_brand(db: Session, brand: BrandCreate) -> Brand:
@@ -11,8 +12,8 @@ def create_brand(db: Session, brand: BrandCreate) -> Brand:
     return db_brand
 
 # READ (get all brands)
-def get_brands(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(Brand).offset(skip).limit(limit).all()
+def get_brands(db: Session, after_id: int | None = None, limit: int = DEFAULT_PAGE_SIZE):
+    return keyset_page(db.query(Brand), Brand.id, after_id, limit)
 
 # READ (get by id)
 def get_brand(db: Session, brand_id: int):
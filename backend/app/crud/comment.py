@@ -1,17 +1,28 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session, selectinload
 from app.models.comment import Comment
 from app.models.keyword import Keyword
 from app.models.comment_keyword import CommentKeyword
-from app.schemas.comment import CommentCreate
+from app.schemas.comment import CommentCreate, CommentBulkCreate
+from app.crud.keyword import get_or_create_keywords
+from app.crud.pagination import DEFAULT_PAGE_SIZE, keyset_page
+
+EXPORT_BATCH_SIZE = 1000
 
 def create_comment(db: Session, comment: CommentCreate, keywords: list[str] = None) -> Comment:
-    db_comment = Comment(video_id=comment.video_id, text=comment.text, sentiment=comment.sentiment)
+    db_comment = Comment(
+        video_id=comment.video_id,
+        text=comment.text,
+        sentiment=comment.sentiment,
+        source_id=comment.source_id,
+        content_hash=comment.content_hash,
+    )
     db.add(db_comment)
     db.commit()
     db.refresh(db_comment)
 
     if keywords:
-        for kw_text in keywords:
+        for kw_text in dict.fromkeys(keywords):
             keyword = db.query(Keyword).filter(Keyword.text == kw_text).first()
             if not keyword:
                 keyword = Keyword(text=kw_text)
@@ -26,8 +37,86 @@ def create_comment(db: Session, comment: CommentCreate, keywords: list[str] = No
 
     return db_comment
 
-def get_comments_by_video(db: Session, video_id: int):
-    return db.query(Comment).filter(Comment.video_id == video_id).all()
+def create_comments_bulk(db: Session, bulk: CommentBulkCreate) -> list[int]:
+    """Insert many comments and their keyword mappings in one transaction; returns IDs in input order."""
+    if not bulk.comments:
+        return []
+
+    keyword_ids = get_or_create_keywords(db, (kw for c in bulk.comments for kw in c.keywords))
+
+    comment_table = Comment.__table__
+    comment_ids = db.execute(
+        insert(comment_table).returning(comment_table.c.id, sort_by_parameter_order=True),
+        [
+            {
+                "video_id": bulk.video_id,
+                "text": c.text,
+                "sentiment": c.sentiment,
+                "source_id": c.source_id,
+                "content_hash": c.content_hash,
+            }
+            for c in bulk.comments
+        ],
+    ).scalars().all()
+
+    mappings = []
+    for comment_id, c in zip(comment_ids, bulk.comments):
+        ids = dict.fromkeys([keyword_ids[kw] for kw in c.keywords] + list(c.keyword_ids))
+        mappings.extend({"comment_id": comment_id, "keyword_id": kw_id, "weight": 1.0} for kw_id in ids)
+    if mappings:
+        db.execute(insert(CommentKeyword.__table__), mappings)
+
+    db.commit()
+    return list(comment_ids)
+
+def get_comments_by_video(db: Session, video_id: int, after_id: int | None = None, limit: int = DEFAULT_PAGE_SIZE):
+    # Three queries per page (comments, mappings, keywords) however many comments there are
+    query = (
+        db.query(Comment)
+        .options(selectinload(Comment.keywords).selectinload(CommentKeyword.keyword))
+        .filter(Comment.video_id == video_id)
+    )
+    return keyset_page(query, Comment.id, after_id, limit)
+
+def iter_comment_export(db: Session, video_id: int | None = None, brand_id: int | None = None,
+                        batch_size: int = EXPORT_BATCH_SIZE):
+    """
+    Yield every comment of a video or brand as a dict, keyword texts included.
+    Rows come from a server-side cursor `batch_size` at a time, so memory use
+    does not grow with the number of comments.
+    """
+    keyword_texts = (
+        select(func.array_agg(Keyword.text))
+        .select_from(CommentKeyword)
+        .join(Keyword, Keyword.id == CommentKeyword.keyword_id)
+        .where(CommentKeyword.comment_id == Comment.id)
+        .scalar_subquery()
+    )
+    stmt = select(
+        Comment.id,
+        Comment.video_id,
+        Comment.text,
+        Comment.sentiment,
+        Comment.source_id,
+        Comment.content_hash,
+        keyword_texts,
+    )
+    if video_id is not None:
+        stmt = stmt.where(Comment.video_id == video_id)
+    if brand_id is not None:
+        stmt = stmt.where(Comment.brand_id == brand_id)
+    stmt = stmt.order_by(Comment.id).execution_options(yield_per=batch_size)
+
+    for row in db.execute(stmt):
+        yield {
+            "id": row.id,
+            "video_id": row.video_id,
+            "text": row.text,
+            "sentiment": row.sentiment,
+            "source_id": row.source_id,
+            "content_hash": row.content_hash,
+            "keywords": row[-1] or [],
+        }
 
 def get_comment(db: Session, comment_id: int):
     return db.query(Comment).filter(Comment.id == comment_id).first()
@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
 from app.models.comment_keyword import CommentKeyword
 from app.schemas.comment_keyword import CommentKeywordCreate
+from app.crud.pagination import DEFAULT_PAGE_SIZE, keyset_page
 
 def create_comment_keyword(db: Session, mapping: CommentKeywordCreate) -> CommentKeyword:
     db_mapping = CommentKeyword(
@@ -13,11 +14,13 @@ def create_comment_keyword(db: Session, mapping: CommentKeywordCreate) -> Commen
     db.refresh(db_mapping)
     return db_mapping
 
-def get_keywords_for_comment(db: Session, comment_id: int):
-    return db.query(CommentKeyword).filter(CommentKeyword.comment_id == comment_id).all()
+def get_keywords_for_comment(db: Session, comment_id: int, after_id: int | None = None, limit: int = DEFAULT_PAGE_SIZE):
+    query = db.query(CommentKeyword).filter(CommentKeyword.comment_id == comment_id)
+    return keyset_page(query, CommentKeyword.id, after_id, limit)
 
-def get_comments_for_keyword(db: Session, keyword_id: int):
-    return db.query(CommentKeyword).filter(CommentKeyword.keyword_id == keyword_id).all()
+def get_comments_for_keyword(db: Session, keyword_id: int, after_id: int | None = None, limit: int = DEFAULT_PAGE_SIZE):
+    query = db.query(CommentKeyword).filter(CommentKeyword.keyword_id == keyword_id)
+    return keyset_page(query, CommentKeyword.id, after_id, limit)
 
 def update_comment_keyword_weight(db: Session, mapping_id: int, weight: float):
     mapping = db.query(CommentKeyword).filter(CommentKeyword.id == mapping_id).first()
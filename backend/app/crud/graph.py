@@ -0,0 +1,115 @@
+from collections import Counter
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, aliased
+from app.models.brand_graph import BrandKeywordStat, BrandKeywordCooccurrence
+from app.models.keyword import Keyword
+from app.models.comment import Comment
+from app.models.video import Video
+from app.models.product import Product
+
+def _dominant_sentiment(positive: int, negative: int, neutral: int) -> str:
+    counts = {"positive": positive, "negative": negative, "neutral": neutral}
+    return max(counts.items(), key=lambda x: x[1])[0]
+
+def top_k_links(links: list[dict], k: int) -> list[dict]:
+    """Keep a link if it is among the k strongest links of either endpoint."""
+    ranked: dict[str, list] = {}
+    for idx, link in enumerate(links):
+        ranked.setdefault(link["source"], []).append((-link["value"], link["target"], idx))
+        ranked.setdefault(link["target"], []).append((-link["value"], link["source"], idx))
+
+    keep = set()
+    for edges in ranked.values():
+        keep.update(idx for _, _, idx in sorted(edges)[:k])
+    return [link for idx, link in enumerate(links) if idx in keep]
+
+def get_graph_from_stats(
+    db: Session,
+    brand_id: int | None = None,
+    min_weight: int = 1,
+    min_link_value: int = 1,
+    max_nodes: int | None = None,
+    top_k_links_per_node: int | None = None,
+):
+    """
+    Graph from the trigger-maintained brand_keyword_stats / brand_keyword_cooccurrence tables.
+
+    Nodes below `min_weight` are dropped and only the `max_nodes` heaviest are kept;
+    links need both endpoints kept and at least `min_link_value` shared comments,
+    and with `top_k_links_per_node` each node keeps only its strongest links.
+    """
+    weight = func.sum(BrandKeywordStat.weight)
+    stats = (
+        db.query(
+            Keyword.id,
+            Keyword.text,
+            weight,
+            func.sum(BrandKeywordStat.positive),
+            func.sum(BrandKeywordStat.negative),
+            func.sum(BrandKeywordStat.neutral),
+        )
+        .join(Keyword, Keyword.id == BrandKeywordStat.keyword_id)
+    )
+    if brand_id:
+        stats = stats.filter(BrandKeywordStat.brand_id == brand_id)
+    stats = (
+        stats.group_by(Keyword.id, Keyword.text)
+        .having(weight >= max(min_weight, 1))
+        .order_by(weight.desc(), Keyword.text)
+    )
+    if max_nodes is not None:
+        stats = stats.limit(max_nodes)
+    node_ids = stats.with_entities(Keyword.id).subquery()
+    stats = stats.all()
+
+    nodes = [
+        {"keyword": text.lower(), "weight": int(weight), "sentiment": _dominant_sentiment(pos, neg, neu)}
+        for _, text, weight, pos, neg, neu in stats
+    ]
+    nodes.sort(key=lambda n: (-n["weight"], n["keyword"]))
+
+    keyword_a = aliased(Keyword)
+    keyword_b = aliased(Keyword)
+    value = func.sum(BrandKeywordCooccurrence.count)
+    pairs = (
+        db.query(keyword_a.text, keyword_b.text, value)
+        .join(keyword_a, keyword_a.id == BrandKeywordCooccurrence.keyword_a_id)
+        .join(keyword_b, keyword_b.id == BrandKeywordCooccurrence.keyword_b_id)
+        .filter(
+            BrandKeywordCooccurrence.keyword_a_id.in_(select(node_ids.c.id)),
+            BrandKeywordCooccurrence.keyword_b_id.in_(select(node_ids.c.id)),
+        )
+    )
+    if brand_id:
+        pairs = pairs.filter(BrandKeywordCooccurrence.brand_id == brand_id)
+    pairs = (
+        pairs.group_by(keyword_a.text, keyword_b.text)
+        .having(value >= max(min_link_value, 1))
+        .all()
+    )
+
+    # Pairs are stored by keyword id; order each link by text so it is stable
+    co_occurrence = Counter()
+    for a, b, count in pairs:
+        co_occurrence[tuple(sorted((a.lower(), b.lower())))] += int(count)
+
+    links = [
+        {"source": a, "target": b, "value": count}
+        for (a, b), count in co_occurrence.items()
+    ]
+    # Deterministic order keeps the serialized graph (and its ETag) stable
+    links.sort(key=lambda l: (-l["value"], l["source"], l["target"]))
+    if top_k_links_per_node is not None:
+        links = top_k_links(links, top_k_links_per_node)
+    return {"nodes": nodes, "links": links}
+
+def get_brand_id_for_video(db: Session, video_id: int) -> int | None:
+    return (
+        db.query(Product.brand_id)
+        .join(Video, Video.product_id == Product.id)
+        .filter(Video.id == video_id)
+        .scalar()
+    )
+
+def get_brand_id_for_comment(db: Session, comment_id: int) -> int | None:
+    return db.query(Comment.brand_id).filter(Comment.id == comment_id).scalar()
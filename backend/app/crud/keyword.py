@@ -1,6 +1,8 @@
 from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from app.models.keyword import Keyword
 from app.schemas.keyword import KeywordCreate
+from app.crud.pagination import DEFAULT_PAGE_SIZE, keyset_page
 
 def create_keyword(db: Session, keyword: KeywordCreate) -> Keyword:
     db_keyword = Keyword(text=keyword.text)
@@ -12,8 +14,36 @@ def create_keyword(db: Session, keyword: KeywordCreate) -> Keyword:
 def get_keyword_by_text(db: Session, text: str):
     return db.query(Keyword).filter(Keyword.text == text).first()
 
-def get_all_keywords(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(Keyword).offset(skip).limit(limit).all()
+def get_or_create_keywords(db: Session, texts) -> dict[str, int]:
+    """
+    Map keyword texts to ids in a bounded number of round-trips: one SELECT for
+    existing keywords and one INSERT ... ON CONFLICT DO NOTHING RETURNING for
+    the rest. Rows lost to a concurrent insert are picked up by a final SELECT.
+    Does not commit. Also used by the legacy pipeline (api/old/db_utils.py).
+    """
+    texts = sorted(set(texts))
+    if not texts:
+        return {}
+
+    ids = dict(db.query(Keyword.text, Keyword.id).filter(Keyword.text.in_(texts)).all())
+    missing = [t for t in texts if t not in ids]
+    if missing:
+        table = Keyword.__table__
+        stmt = (
+            pg_insert(table)
+            .values([{"text": t} for t in missing])
+            .on_conflict_do_nothing(index_elements=["text"])
+            .returning(table.c.text, table.c.id)
+        )
+        ids.update(dict(db.execute(stmt).all()))
+
+        raced = [t for t in missing if t not in ids]
+        if raced:
+            ids.update(dict(db.query(Keyword.text, Keyword.id).filter(Keyword.text.in_(raced)).all()))
+    return ids
+
+def get_all_keywords(db: Session, after_id: int | None = None, limit: int = DEFAULT_PAGE_SIZE):
+    return keyset_page(db.query(Keyword), Keyword.id, after_id, limit)
 
 def delete_keyword(db: Session, keyword_id: int):
     keyword = db.query(Keyword).filter(Keyword.id == keyword_id).first()
@@ -0,0 +1,18 @@
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+def keyset_page(query, id_column, after_id: int | None = None, limit: int = DEFAULT_PAGE_SIZE):
+    """
+    One page of `query` in `id_column` order, starting after `after_id`.
+    Uses the primary key index instead of OFFSET, so deep pages cost the same as
+    the first; pass the last id of a page as `after_id` to get the next one.
+    """
+    if after_id is not None:
+        query = query.filter(id_column > after_id)
+    return query.order_by(id_column).limit(limit).all()
+
+def keyset_select(stmt, id_column, after_id: int | None = None, limit: int = DEFAULT_PAGE_SIZE):
+    """keyset_page for 2.0-style select() statements (used by the async CRUD)."""
+    if after_id is not None:
+        stmt = stmt.where(id_column > after_id)
+    return stmt.order_by(id_column).limit(limit)
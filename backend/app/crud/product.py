@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
 from app.models.product import Product
 from app.schemas.product import ProductCreate
+from app.crud.pagination import DEFAULT_PAGE_SIZE, keyset_page
 
 def create_product(db: Session, product: ProductCreate) -> Product:
     db_product = Product(name=product.name, brand_id=product.brand_id)
@@ -9,8 +10,8 @@ def create_product(db: Session, product: ProductCreate) -> Product:
     db.refresh(db_product)
     return db_product
 
-def get_products_by_brand(db: Session, brand_id: int):
-    return db.query(Product).filter(Product.brand_id == brand_id).all()
+def get_products_by_brand(db: Session, brand_id: int, after_id: int | None = None, limit: int = DEFAULT_PAGE_SIZE):
+    return keyset_page(db.query(Product).filter(Product.brand_id == brand_id), Product.id, after_id, limit)
 
 def get_product(db: Session, product_id: int):
     return db.query(Product).filter(Product.id == product_id).first()
@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
 from app.models.user import User
 from app.schemas.user import UserCreate
+from app.crud.pagination import DEFAULT_PAGE_SIZE, keyset_page
 from app.core.security import get_password_hash
 
 def create_user(db: Session, user: UserCreate) -> User:
@@ -18,8 +19,8 @@ def create_user(db: Session, user: UserCreate) -> User:
 def get_user_by_username(db: Session, username: str):
     return db.query(User).filter(User.username == username).first()
 
-def get_users_by_brand(db: Session, brand_id: int):
-    return db.query(User).filter(User.brand_id == brand_id).all()
+def get_users_by_brand(db: Session, brand_id: int, after_id: int | None = None, limit: int = DEFAULT_PAGE_SIZE):
+    return keyset_page(db.query(User).filter(User.brand_id == brand_id), User.id, after_id, limit)
 
 def get_user(db: Session, user_id: int):
     return db.query(User).filter(User.id == user_id).first()
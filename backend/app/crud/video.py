@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
 from app.models.video import Video
 from app.schemas.video import VideoCreate
+from app.crud.pagination import DEFAULT_PAGE_SIZE, keyset_page
 
 def create_video(db: Session, video: VideoCreate) -> Video:
     db_video = Video(product_id=video.product_id, platform=video.platform, url=video.url)
@@ -9,8 +10,8 @@ def create_video(db: Session, video: VideoCreate) -> Video:
     db.refresh(db_video)
     return db_video
 
-def get_videos_by_product(db: Session, product_id: int):
-    return db.query(Video).filter(Video.product_id == product_id).all()
+def get_videos_by_product(db: Session, product_id: int, after_id: int | None = None, limit: int = DEFAULT_PAGE_SIZE):
+    return keyset_page(db.query(Video).filter(Video.product_id == product_id), Video.id, after_id, limit)
 
 def get_video(db: Session, video_id: int):
     return db.query(Video).filter(Video.id == video_id).first()
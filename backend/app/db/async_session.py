@@ -0,0 +1,27 @@
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from app.core.config import settings
+from app.db.engine import pool_options
+from app.db.metrics import instrument_engine
+
+def async_database_url(url: str) -> str:
+    """Same database as DATABASE_URL, through the asyncpg driver."""
+    return make_url(url).set(drivername="postgresql+asyncpg").render_as_string(hide_password=False)
+
+# Created on first use so the sync-only deployment never needs asyncpg installed
+_async_sessionmaker: async_sessionmaker[AsyncSession] | None = None
+
+def get_async_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    global _async_sessionmaker
+    if _async_sessionmaker is None:
+        url = async_database_url(settings.DATABASE_URL)
+        engine = create_async_engine(url, **pool_options())
+        instrument_engine(engine.sync_engine, make_url(url).render_as_string(hide_password=True))
+        _async_sessionmaker = async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
+    return _async_sessionmaker
+
+async def dispose_async_engine():
+    global _async_sessionmaker
+    if _async_sessionmaker is not None:
+        await _async_sessionmaker.kw["bind"].dispose()
+        _async_sessionmaker = None
@@ -7,3 +7,4 @@ from app.models.comment import Comment
 from app.models.keyword import Keyword
 from app.models.comment_keyword import CommentKeyword
 from app.models.user import User
+from app.models.brand_graph import BrandKeywordStat, BrandKeywordCooccurrence
@@ -0,0 +1,30 @@
+import threading
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, make_url
+from app.core.config import settings
+from app.db.metrics import InstrumentedQueuePool, instrument_engine
+
+# One engine per database URL per process. The API (app/db/session.py) and the
+# legacy pipeline (api/old/db_utils.py) both get their engine from here, so
+# they share pool settings, instrumentation and -- in the same process -- the pool.
+
+_engines: dict[str, Engine] = {}
+_lock = threading.Lock()
+
+def pool_options() -> dict:
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_pre_ping": True,
+    }
+
+def get_engine(url: str | None = None) -> Engine:
+    url = url or settings.DATABASE_URL
+    with _lock:
+        if url not in _engines:
+            engine = create_engine(url, poolclass=InstrumentedQueuePool, **pool_options())
+            instrument_engine(engine, make_url(url).render_as_string(hide_password=True))
+            _engines[url] = engine
+        return _engines[url]
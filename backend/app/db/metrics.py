@@ -0,0 +1,140 @@
+import time
+import threading
+from bisect import bisect_left
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+# Process-wide database metrics fed by SQLAlchemy event hooks and rendered in
+# the Prometheus text exposition format (GET /metrics). Written by hand rather
+# than with prometheus_client so the pipeline scripts need nothing extra.
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_TYPES = ("select", "insert", "update", "delete")
+
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self, name: str, labels: str = "") -> list[str]:
+        sep = "," if labels else ""
+        lines, cumulative = [], 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels}{sep}le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels}{sep}le="+Inf"}} {self.count}')
+        suffix = f"{{{labels}}}" if labels else ""
+        lines.append(f"{name}_sum{suffix} {self.sum:.6f}")
+        lines.append(f"{name}_count{suffix} {self.count}")
+        return lines
+
+
+def statement_type(statement: str) -> str:
+    keyword = statement.lstrip().split(None, 1)[0].lower() if statement.strip() else ""
+    if keyword == "with":
+        # CTEs are almost always reads here; data-modifying CTEs are counted as selects
+        return "select"
+    return keyword if keyword in STATEMENT_TYPES else "other"
+
+
+class DbMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.statement_seconds = {t: Histogram() for t in (*STATEMENT_TYPES, "other")}
+        self.rows = {t: 0 for t in self.statement_seconds}
+        self.errors = 0
+        self.checkout_wait_seconds = Histogram()
+        self.engines: dict[str, Engine] = {}
+
+    def observe_statement(self, kind: str, seconds: float, rows: int):
+        with self._lock:
+            self.statement_seconds[kind].observe(seconds)
+            self.rows[kind] += max(rows, 0)
+
+    def observe_error(self):
+        with self._lock:
+            self.errors += 1
+
+    def observe_checkout_wait(self, seconds: float):
+        with self._lock:
+            self.checkout_wait_seconds.observe(seconds)
+
+    def render(self) -> str:
+        with self._lock:
+            lines = [
+                "# HELP db_statement_duration_seconds Time spent executing SQL statements.",
+                "# TYPE db_statement_duration_seconds histogram",
+            ]
+            for kind, histogram in self.statement_seconds.items():
+                lines += histogram.render("db_statement_duration_seconds", f'statement="{kind}"')
+
+            lines += [
+                "# HELP db_statement_rows_total Rows returned or affected by SQL statements.",
+                "# TYPE db_statement_rows_total counter",
+            ]
+            lines += [f'db_statement_rows_total{{statement="{kind}"}} {n}' for kind, n in self.rows.items()]
+
+            lines += [
+                "# HELP db_statement_errors_total SQL statements that raised.",
+                "# TYPE db_statement_errors_total counter",
+                f"db_statement_errors_total {self.errors}",
+                "# HELP db_pool_checkout_wait_seconds Time spent waiting for a pooled connection.",
+                "# TYPE db_pool_checkout_wait_seconds histogram",
+            ]
+            lines += self.checkout_wait_seconds.render("db_pool_checkout_wait_seconds")
+
+            lines += [
+                "# HELP db_pool_connections Pooled connections by state.",
+                "# TYPE db_pool_connections gauge",
+            ]
+            for name, engine in self.engines.items():
+                pool = engine.pool
+                if isinstance(pool, QueuePool):
+                    lines.append(f'db_pool_connections{{engine="{name}",state="checked_out"}} {pool.checkedout()}')
+                    lines.append(f'db_pool_connections{{engine="{name}",state="idle"}} {pool.checkedin()}')
+                    lines.append(f'db_pool_connections{{engine="{name}",state="overflow"}} {max(pool.overflow(), 0)}')
+        return "\n".join(lines) + "\n"
+
+
+metrics = DbMetrics()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            metrics.observe_checkout_wait(time.perf_counter() - start)
+
+
+def instrument_engine(engine: Engine, name: str):
+    """Attach statement timing / row count / error hooks to `engine`."""
+    metrics.engines[name] = engine
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _record_statement(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        metrics.observe_statement(statement_type(statement), elapsed, cursor.rowcount)
+
+    @event.listens_for(engine, "handle_error")
+    def _record_error(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_start"):
+            conn.info["query_start"].pop()
+        metrics.observe_error()
@@ -0,0 +1,24 @@
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import Integer, ForeignKey
+from app.db.base_class import Base
+
+# Materialized graph tables. Maintained by PostgreSQL triggers on
+# comment_keywords / comments (see migration e0aa27765e46), never written by the app.
+
+class BrandKeywordStat(Base):
+    __tablename__ = "brand_keyword_stats"
+
+    brand_id: Mapped[int] = mapped_column(ForeignKey("brands.id"), primary_key=True)
+    keyword_id: Mapped[int] = mapped_column(ForeignKey("keywords.id"), primary_key=True)
+    weight: Mapped[int] = mapped_column(Integer, default=0)
+    positive: Mapped[int] = mapped_column(Integer, default=0)
+    negative: Mapped[int] = mapped_column(Integer, default=0)
+    neutral: Mapped[int] = mapped_column(Integer, default=0)
+
+class BrandKeywordCooccurrence(Base):
+    __tablename__ = "brand_keyword_cooccurrence"
+
+    brand_id: Mapped[int] = mapped_column(ForeignKey("brands.id"), primary_key=True)
+    keyword_a_id: Mapped[int] = mapped_column(ForeignKey("keywords.id"), primary_key=True)  # always < keyword_b_id
+    keyword_b_id: Mapped[int] = mapped_column(ForeignKey("keywords.id"), primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, default=0)
@@ -8,8 +8,15 @@ class Comment(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     text: Mapped[str] = mapped_column(Text, nullable=False)
     sentiment: Mapped[str | None] = mapped_column(String, nullable=True)
+    source_id: Mapped[str | None] = mapped_column(String, nullable=True, index=True)  # platform comment id
+    content_hash: Mapped[str | None] = mapped_column(String, nullable=True)
 
-    video_id: Mapped[int] = mapped_column(ForeignKey("videos.id"))
+    video_id: Mapped[int] = mapped_column(ForeignKey("videos.id"), index=True)
     video: Mapped["Video"] = relationship("Video", back_populates="comments")
 
+    # Denormalized from video -> product -> brand so brand scoping is one hop;
+    # filled in and kept current by database triggers (migration 706e9ee6f51a)
+    product_id: Mapped[int | None] = mapped_column(ForeignKey("products.id"), nullable=True, index=True)
+    brand_id: Mapped[int | None] = mapped_column(ForeignKey("brands.id"), nullable=True, index=True)
+
     keywords: Mapped[list["CommentKeyword"]] = relationship("CommentKeyword", back_populates="comment")
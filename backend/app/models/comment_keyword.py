@@ -1,16 +1,29 @@
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import Integer, Float, ForeignKey
+from sqlalchemy import Integer, Float, ForeignKey, UniqueConstraint, Index
 from app.db.base_class import Base
 
 class CommentKeyword(Base):
     __tablename__ = "comment_keywords"
+    __table_args__ = (
+        # Also serves lookups by comment_id (leading column)
+        UniqueConstraint("comment_id", "keyword_id", name="uq_comment_keywords_comment_id_keyword_id"),
+        Index("ix_comment_keywords_brand_id_keyword_id", "brand_id", "keyword_id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     weight: Mapped[float] = mapped_column(Float, default=1.0)
 
     comment_id: Mapped[int] = mapped_column(ForeignKey("comments.id"))
-    keyword_id: Mapped[int] = mapped_column(ForeignKey("keywords.id"))
+    keyword_id: Mapped[int] = mapped_column(ForeignKey("keywords.id"), index=True)
+
+    # Copied from the comment by a database trigger so brand-level
+    # aggregations scan this table alone (migration 706e9ee6f51a)
+    product_id: Mapped[int | None] = mapped_column(ForeignKey("products.id"), nullable=True, index=True)
+    brand_id: Mapped[int | None] = mapped_column(ForeignKey("brands.id"), nullable=True)
 
     comment: Mapped["Comment"] = relationship("Comment", back_populates="keywords")
     keyword: Mapped["Keyword"] = relationship("Keyword", back_populates="comment_keywords")
 
+    @property
+    def keyword_text(self) -> str:
+        return self.keyword.text
@@ -8,7 +8,7 @@ class Product(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     name: Mapped[str] = mapped_column(String, index=True)
 
-    brand_id: Mapped[int] = mapped_column(ForeignKey("brands.id"))
+    brand_id: Mapped[int] = mapped_column(ForeignKey("brands.id"), index=True)
     brand: Mapped["Brand"] = relationship("Brand", back_populates="products")
 
     videos: Mapped[list["Video"]] = relationship("Video", back_populates="product")
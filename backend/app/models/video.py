@@ -9,7 +9,7 @@ class Video(Base):
     platform: Mapped[str] = mapped_column(String)
     url: Mapped[str] = mapped_column(String, unique=True)
 
-    product_id: Mapped[int] = mapped_column(ForeignKey("products.id"))
+    product_id: Mapped[int] = mapped_column(ForeignKey("products.id"), index=True)
     product: Mapped["Product"] = relationship("Product", back_populates="videos")
 
     comments: Mapped[list["Comment"]] = relationship("Comment", back_populates="video")
\ No newline at end of file
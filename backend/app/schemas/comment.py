@@ -1,15 +1,29 @@
 from pydantic import BaseModel
 from typing import List
-from app.schemas.comment_keyword import CommentKeywordOut
+from app.schemas.comment_keyword import CommentKeywordOut, CommentKeywordTextOut
 
 class CommentBase(BaseModel):
     text: str
     sentiment: str | None = None
+    source_id: str | None = None     # platform comment id, for incremental loads
+    content_hash: str | None = None
 
 class CommentCreate(CommentBase):
     video_id: int
     keywords: List[int] = []  # keyword IDs to attach
 
+class CommentBulkItem(CommentBase):
+    keywords: List[str] = []     # keyword texts, created if missing
+    keyword_ids: List[int] = []  # existing keyword IDs
+
+class CommentBulkCreate(BaseModel):
+    video_id: int
+    comments: List[CommentBulkItem]
+
+class CommentBulkOut(BaseModel):
+    video_id: int
+    ids: List[int]  # created comment IDs, in request order
+
 class CommentOut(CommentBase):
     id: int
     video_id: int
@@ -17,3 +31,9 @@ class CommentOut(CommentBase):
 
     class Config:
         orm_mode = True
+
+class CommentWithKeywordsOut(CommentOut):
+    keywords: List[CommentKeywordTextOut] = []  # join objects with keyword text inline
+
+    class Config:
+        orm_mode = True
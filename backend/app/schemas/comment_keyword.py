@@ -14,3 +14,9 @@ class CommentKeywordOut(CommentKeywordBase):
 
     class Config:
         orm_mode = True
+
+class CommentKeywordTextOut(CommentKeywordOut):
+    keyword_text: str
+
+    class Config:
+        orm_mode = True
@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+from typing import List
+
+class GraphNode(BaseModel):
+    keyword: str
+    weight: int
+    sentiment: str
+
+class GraphLink(BaseModel):
+    source: str
+    target: str
+    value: int
+
+class GraphOut(BaseModel):
+    nodes: List[GraphNode] = []
+    links: List[GraphLink] = []
@@ -0,0 +1,98 @@
+from typing import List
+
+from pydantic import TypeAdapter
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+import app.db.base  # noqa: F401  (registers every model)
+from app.db.session import SessionLocal, engine
+from app.models.brand import Brand
+from app.models.product import Product
+from app.models.video import Video
+from app.models.comment import Comment
+from app.models.keyword import Keyword
+from app.models.comment_keyword import CommentKeyword
+from app.crud.comment import get_comments_by_video
+from app.crud.pagination import DEFAULT_PAGE_SIZE
+from app.schemas.comment import CommentWithKeywordsOut
+
+MAX_QUERIES = 3  # comments, comment_keywords, keywords
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args):
+        self.count += 1
+
+    def __enter__(self):
+        event.listen(engine, "before_cursor_execute", self)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(engine, "before_cursor_execute", self)
+
+
+def make_video(db: Session, n_comments: int, keywords: List[Keyword]) -> Video:
+    brand = Brand(name=f"Query count brand {n_comments}")
+    product = Product(name="Query count product", brand=brand)
+    video = Video(product=product, platform="TikTok", url=f"http://example.com/query-count/{n_comments}")
+    db.add(video)
+    db.flush()
+
+    for i in range(n_comments):
+        comment = Comment(video_id=video.id, text=f"comment {i}", sentiment="neutral")
+        comment.keywords = [
+            CommentKeyword(keyword_id=kw.id, weight=0.5)
+            for kw in keywords[: i % len(keywords) + 1]
+        ]
+        db.add(comment)
+    db.flush()
+    return video
+
+
+def count_listing_queries(db: Session, video_id: int, after_id: int | None = None,
+                          limit: int = DEFAULT_PAGE_SIZE):
+    """Queries spent listing one page; returns (query count, comments listed)."""
+    db.expire_all()
+    with QueryCounter() as counter:
+        comments = get_comments_by_video(db, video_id, after_id=after_id, limit=limit)
+        # Building the response models touches every nested keyword, so any lazy load shows up here
+        TypeAdapter(List[CommentWithKeywordsOut]).validate_python(comments, from_attributes=True)
+    return counter.count, [c.id for c in comments]
+
+
+def run_test():
+    db: Session = SessionLocal()
+    try:
+        keywords = [Keyword(text=f"query-count keyword {i}") for i in range(5)]
+        db.add_all(keywords)
+        db.flush()
+
+        counts = {}
+        for n_comments in (5, 500):
+            video = make_video(db, n_comments, keywords)
+            # One page holding every comment (500 is below MAX_PAGE_SIZE)
+            counts[n_comments], ids = count_listing_queries(db, video.id, limit=n_comments)
+            assert len(ids) == n_comments, (n_comments, len(ids))
+            print(f"✅ {n_comments} comments -> {counts[n_comments]} queries")
+
+        assert counts[5] == counts[500], counts
+        assert counts[500] <= MAX_QUERIES, counts
+        print("✅ Comment listing runs a constant number of queries")
+
+        # Keyset pagination: the second page costs the same as the first
+        _, first_page = count_listing_queries(db, video.id, limit=250)
+        second_count, second_page = count_listing_queries(db, video.id, after_id=first_page[-1], limit=250)
+        assert len(second_page) == 250 and second_page[0] > first_page[-1], second_page[:1]
+        assert second_count <= MAX_QUERIES, second_count
+        print(f"✅ Second page (after_id={first_page[-1]}) -> {second_count} queries")
+    finally:
+        # Leave the database as it was
+        db.rollback()
+        db.close()
+
+
+if __name__ == "__main__":
+    run_test()
@@ -7,6 +7,14 @@ import TikTokEmbed from "./components/TikTokEmbed";
 import LoadingOverlay from "./components/LoadingOverlay";
 import { useComments } from "./hooks/useComments";
 
+const BRAND_ID = process.env.NEXT_PUBLIC_BRAND_ID ?? "1";
+// Pruned server-side so large brands stay small enough for the D3 layout
+const GRAPH_FILTERS = new URLSearchParams({
+  max_nodes: "150",
+  top_k_links_per_node: "8",
+  min_link_value: "2",
+});
+
 export default function BrandBuzz() {
   const [graphData, setGraphData] = useState<{ nodes: GraphNode[]; links: GraphLink[] }>({
     nodes: [],
@@ -20,7 +28,15 @@ export default function BrandBuzz() {
   const fetchGraphData = async () => {
     try {
       setLoading(true);
-      const response = await fetch(`${process.env.NEXT_PUBLIC_API_BASE}/graph`);
+      // "no-cache" revalidates with If-None-Match; an unchanged graph comes back as a 304
+      // and the browser serves the cached body
+      const response = await fetch(
+        `${process.env.NEXT_PUBLIC_API_BASE}/brands/${BRAND_ID}/graph?${GRAPH_FILTERS}`,
+        { cache: "no-cache" }
+      );
+      if (!response.ok) {
+        throw new Error(`Graph request failed: ${response.status}`);
+      }
       const data = await response.json();
       setGraphData(data);
     } catch (error) {